@@ -11,7 +11,10 @@ ENHANCEMENTS:
 - ALL ERRORS FIXED
 """
 
-from flask import Flask, request, jsonify, session, send_file
+import time
+_MODULE_START = time.perf_counter()
+
+from flask import Flask, Blueprint, current_app, request, jsonify, session, send_file
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
@@ -19,56 +22,183 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
 import os
+import sys
 import sqlite3
-import PyPDF2
-import docx
 import re
 import json
-from groq import Groq
+import hashlib
+import difflib
+import html
+import threading
+import importlib
 from datetime import timedelta, datetime
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, HRFlowable
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
 import logging
+from concurrent.futures import ThreadPoolExecutor
+import prompt_builder
+import docx_stream
+import static_assets
+import shared_state  # registers the sqlite:// rate-limit storage
+
+class LazyModule:
+    """Module proxy that is only really imported on first attribute access.
+
+    The import runs under a lock: importlib's LazyLoader is not thread-safe before Python 3.12,
+    and the threaded dev server / gthread workers can hit a module for the first time concurrently.
+    """
+    _lock = threading.RLock()
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            with LazyModule._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+def lazy_import(name):
+    return sys.modules.get(name) or LazyModule(name)
+
+# Heavy subsystems: loaded on first use (or up front with preload=True)
+PyPDF2 = lazy_import('PyPDF2')
+docx = lazy_import('docx')
+matching = lazy_import('matching')   # NumPy
+dedup = lazy_import('dedup')         # NumPy
 
 load_dotenv()
 
-app = Flask(__name__, static_folder='.')
-app.secret_key = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production-12345')
-app.config['UPLOAD_FOLDER'] = 'uploads'
-app.config['GENERATED_FOLDER'] = 'generated'
-app.config['MAX_CONTENT_LENGTH'] = 5242880
-app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
-app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
-app.config['SESSION_COOKIE_SECURE'] = False
-app.config['SESSION_COOKIE_HTTPONLY'] = True
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
-CORS(app, supports_credentials=True, resources={r"/api/*": {"origins": "*"}})
-limiter = Limiter(app=app, key_func=get_remote_address, default_limits=["200 per day", "50 per hour"], storage_uri="memory://")
+limiter = Limiter(key_func=get_remote_address, default_limits=["200 per day", "50 per hour"])
+bp = Blueprint('main', __name__)
 
 GROQ_API_KEY = os.getenv('GROQ_API_KEY')
-if GROQ_API_KEY:
+groq_client = None
+_groq_lock = threading.Lock()
+_groq_initialized = False
+
+def get_groq_client():
+    """Groq client, created (and the SDK imported) on first use"""
+    global groq_client, _groq_initialized
+    if groq_client is None and not _groq_initialized:
+        with _groq_lock:
+            if not _groq_initialized:
+                if GROQ_API_KEY:
+                    try:
+                        from groq import Groq
+                        groq_client = Groq(api_key=GROQ_API_KEY)
+                        print("✓ Groq AI configured")
+                    except Exception as e:
+                        print(f"⚠️  Groq initialization error: {e}")
+                else:
+                    print("⚠️  GROQ_API_KEY not found")
+                _groq_initialized = True
+    return groq_client
+
+HEAVY_MODULES = ('reportlab', 'PyPDF2', 'docx', 'groq', 'numpy')
+_startup = {}
+
+def preload_heavy_modules():
+    """Import everything a request may need, for pre-forking servers (gunicorn --preload).
+
+    Workers forked afterwards share these pages copy-on-write; gc.freeze() keeps the
+    collector from touching (and so copying) them in every worker.
+    """
+    import gc
+    import groq  # noqa: F401 - SDK only; the client (and its connection pool) is created per worker
+    from reportlab.platypus import SimpleDocTemplate  # noqa: F401
+    PyPDF2.PdfReader, docx.Document
+    matching._projection()
+    matching._hyperplanes()
+    dedup._permutations()
+    gc.collect()
+    gc.freeze()
+
+def _is_loaded(name):
+    return name in sys.modules
+
+def current_rss_mb():
     try:
-        groq_client = Groq(api_key=GROQ_API_KEY)
-        print("✓ Groq AI configured")
-    except Exception as e:
-        print(f"⚠️  Groq initialization error: {e}")
-        groq_client = None
-else:
-    print("⚠️  GROQ_API_KEY not found")
-    groq_client = None
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    try:
+        import resource
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)  # peak, KB on Linux
+    except ImportError:
+        return None
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-logger = logging.getLogger(__name__)
+def startup_report():
+    return {
+        'import_ms': _startup.get('import_ms'),
+        'create_app_ms': _startup.get('create_app_ms'),
+        'preloaded': _startup.get('preloaded', False),
+        'rss_mb': current_rss_mb(),
+        'loaded_modules': [m for m in HEAVY_MODULES if _is_loaded(m)]
+    }
+
+def create_app(preload=None):
+    """Application factory.
+
+    preload=True (or PRELOAD_HEAVY=1) imports the PDF/DOCX/LLM/NumPy stacks up front, e.g.
+    gunicorn --preload "app:create_app(preload=True)"; otherwise they load on first use.
+    """
+    started = time.perf_counter()
+    app = Flask(__name__, static_folder='.')
+    app.secret_key = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production-12345')
+    app.config['UPLOAD_FOLDER'] = 'uploads'
+    app.config['GENERATED_FOLDER'] = 'generated'
+    app.config['MAX_CONTENT_LENGTH'] = 5242880
+    app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
+    app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
+    app.config['SESSION_COOKIE_SECURE'] = False
+    app.config['SESSION_COOKIE_HTTPONLY'] = True
+    app.config['PROMPT_RESUME_TOKENS'] = int(os.getenv('PROMPT_RESUME_TOKENS', prompt_builder.DEFAULT_RESUME_TOKENS))
+    app.config['PROMPT_JD_TOKENS'] = int(os.getenv('PROMPT_JD_TOKENS', prompt_builder.DEFAULT_JD_TOKENS))
+    app.config['GENERATION_MODE'] = os.getenv('GENERATION_MODE', 'sections')  # 'sections' (concurrent) or 'single'
+    app.config['GENERATION_WORKERS'] = int(os.getenv('GENERATION_WORKERS', 6))
+    app.config['GENERATION_RETRIES'] = int(os.getenv('GENERATION_RETRIES', 2))
+    app.config['STATIC_MAX_AGE'] = int(os.getenv('STATIC_MAX_AGE', 3600))
+    # Counters live in a local SQLite file so every worker process enforces the same limits
+    app.config['RATELIMIT_STORAGE_URI'] = os.getenv('RATELIMIT_STORAGE_URI', f"sqlite:///{shared_state.DEFAULT_PATH}")
+    app.config['RATELIMIT_ENABLED'] = os.getenv('RATELIMIT_ENABLED', '1') != '0'
+
+    CORS(app, supports_credentials=True, resources={r"/api/*": {"origins": "*"}})
+    limiter.init_app(app)
+    app.register_blueprint(bp)
+    # Frontend pages, precompressed and held in memory
+    try:
+        app.extensions['static_assets'] = static_assets.load_assets(FRONTEND_DIR)
+    except OSError as e:
+        logger.warning(f"⚠️  Frontend pages not loaded from {FRONTEND_DIR!r}: {e}")
+        app.extensions['static_assets'] = {}
+
+    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    os.makedirs(app.config['GENERATED_FOLDER'], exist_ok=True)
+    os.makedirs('database', exist_ok=True)
+    with app.app_context():
+        init_db()
+
+    if preload if preload is not None else os.getenv('PRELOAD_HEAVY') == '1':
+        preload_heavy_modules()
+        _startup['preloaded'] = True
 
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-os.makedirs(app.config['GENERATED_FOLDER'], exist_ok=True)
-os.makedirs('database', exist_ok=True)
+    _startup['create_app_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    report = startup_report()
+    logger.info(f"✓ App ready: import {report['import_ms']} ms + create {report['create_app_ms']} ms, RSS {report['rss_mb']} MB, loaded {report['loaded_modules']}")
+    return app
 
 ALLOWED_EXTENSIONS = {'pdf', 'docx'}
+FRONTEND_DIR = os.getenv('FRONTEND_DIR') or os.path.dirname(os.path.abspath(__file__))
+MATCH_INDEX_DIR = os.path.join('database', 'vectors')
+SHARED_CACHE_TTL = 300
+RECRUITER_EMAILS = {e.strip().lower() for e in os.getenv('RECRUITER_EMAILS', '').split(',') if e.strip()}
 
 def get_db():
     db = sqlite3.connect('database/ats_checker.db')
@@ -77,18 +207,248 @@ def get_db():
 
 def init_db():
     db = get_db()
+    # WAL: readers in other worker processes don't block on (or block) a writer
+    db.execute('PRAGMA journal_mode=WAL')
     db.executescript('''
         CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY, name TEXT, email TEXT UNIQUE, password TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
         CREATE TABLE IF NOT EXISTS analyses (id INTEGER PRIMARY KEY, user_id INTEGER, filename TEXT, original_score INTEGER, improved_score INTEGER, template_used TEXT, matched_keywords TEXT, missing_keywords TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
         CREATE TABLE IF NOT EXISTS resumes (id INTEGER PRIMARY KEY, user_id INTEGER, analysis_id INTEGER, file_path TEXT, format TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
         CREATE INDEX IF NOT EXISTS idx_user_email ON users(email);
+
+        -- Covering index for keyset-paginated history (no table lookups)
+        CREATE INDEX IF NOT EXISTS idx_analyses_user_history ON analyses(user_id, id, created_at, original_score, improved_score, template_used, filename);
+        CREATE INDEX IF NOT EXISTS idx_analyses_created ON analyses(created_at);
+
+        -- Summary tables, maintained incrementally so /api/stats never scans analyses
+        CREATE TABLE IF NOT EXISTS score_buckets (user_id INTEGER, kind TEXT, bucket INTEGER, count INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (user_id, kind, bucket)) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS template_stats (user_id INTEGER, template TEXT, runs INTEGER NOT NULL DEFAULT 0, improvement_total INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (user_id, template)) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS keyword_misses (user_id INTEGER, keyword TEXT, misses INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (user_id, keyword)) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_keyword_misses_top ON keyword_misses(user_id, misses DESC, keyword);
+
+        CREATE TRIGGER IF NOT EXISTS trg_analyses_insert_stats AFTER INSERT ON analyses
+        WHEN NEW.original_score IS NOT NULL
+        BEGIN
+            INSERT INTO score_buckets (user_id, kind, bucket, count) VALUES (NEW.user_id, 'original', MIN(NEW.original_score / 10, 9), 1)
+            ON CONFLICT(user_id, kind, bucket) DO UPDATE SET count = count + 1;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_analyses_update_stats AFTER UPDATE OF improved_score, template_used ON analyses
+        BEGIN
+            UPDATE score_buckets SET count = count - 1
+            WHERE user_id = OLD.user_id AND kind = 'improved' AND bucket = MIN(OLD.improved_score / 10, 9);
+            UPDATE template_stats SET runs = runs - 1, improvement_total = improvement_total - (OLD.improved_score - OLD.original_score)
+            WHERE user_id = OLD.user_id AND template = OLD.template_used AND OLD.improved_score IS NOT NULL;
+
+            INSERT INTO score_buckets (user_id, kind, bucket, count)
+            SELECT NEW.user_id, 'improved', MIN(NEW.improved_score / 10, 9), 1 WHERE NEW.improved_score IS NOT NULL
+            ON CONFLICT(user_id, kind, bucket) DO UPDATE SET count = count + 1;
+            INSERT INTO template_stats (user_id, template, runs, improvement_total)
+            SELECT NEW.user_id, NEW.template_used, 1, NEW.improved_score - NEW.original_score
+            WHERE NEW.improved_score IS NOT NULL AND NEW.template_used IS NOT NULL
+            ON CONFLICT(user_id, template) DO UPDATE SET runs = runs + 1, improvement_total = improvement_total + excluded.improvement_total;
+        END;
+
+        -- Extracted resume text, indexed with FTS5 (external content, kept in sync by triggers)
+        CREATE TABLE IF NOT EXISTS resume_documents (id INTEGER PRIMARY KEY, user_id INTEGER, analysis_id INTEGER, filename TEXT, content TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE INDEX IF NOT EXISTS idx_resume_documents_user ON resume_documents(user_id, id);
+        CREATE VIRTUAL TABLE IF NOT EXISTS resume_fts USING fts5(filename, content, content='resume_documents', content_rowid='id', tokenize='unicode61');
+
+        CREATE TRIGGER IF NOT EXISTS trg_resume_documents_ai AFTER INSERT ON resume_documents BEGIN
+            INSERT INTO resume_fts (rowid, filename, content) VALUES (NEW.id, NEW.filename, NEW.content);
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_resume_documents_ad AFTER DELETE ON resume_documents BEGIN
+            INSERT INTO resume_fts (resume_fts, rowid, filename, content) VALUES ('delete', OLD.id, OLD.filename, OLD.content);
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_resume_documents_au AFTER UPDATE ON resume_documents BEGIN
+            INSERT INTO resume_fts (resume_fts, rowid, filename, content) VALUES ('delete', OLD.id, OLD.filename, OLD.content);
+            INSERT INTO resume_fts (rowid, filename, content) VALUES (NEW.id, NEW.filename, NEW.content);
+        END;
+
+        CREATE TABLE IF NOT EXISTS job_descriptions (id INTEGER PRIMARY KEY, user_id INTEGER, content_hash TEXT UNIQUE, content TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+
+        -- MinHash signatures + LSH band keys for near-duplicate detection
+        CREATE TABLE IF NOT EXISTS resume_signatures (resume_doc_id INTEGER PRIMARY KEY, user_id INTEGER, signature BLOB);
+        CREATE TABLE IF NOT EXISTS resume_lsh_bands (band INTEGER, hash INTEGER, resume_doc_id INTEGER, user_id INTEGER);
+        CREATE INDEX IF NOT EXISTS idx_resume_lsh_lookup ON resume_lsh_bands(band, hash, user_id, resume_doc_id);
+
+        -- AI output cache, reused when the same (or a near-duplicate) resume is generated for the same JD
+        CREATE TABLE IF NOT EXISTS generated_resumes (id INTEGER PRIMARY KEY, user_id INTEGER, resume_doc_id INTEGER, job_id INTEGER, content TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE INDEX IF NOT EXISTS idx_generated_lookup ON generated_resumes(resume_doc_id, job_id, id);
+        -- Per-section AI output keyed by an input fingerprint, so iterative edits only regenerate what changed
+        CREATE TABLE IF NOT EXISTS generated_sections (user_id INTEGER, fingerprint TEXT, content TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, PRIMARY KEY (user_id, fingerprint));
     ''')
+    # Summary tables were added after analyses existed - backfill them once
+    if not db.execute('SELECT 1 FROM score_buckets LIMIT 1').fetchone() and db.execute('SELECT 1 FROM analyses LIMIT 1').fetchone():
+        rebuild_analysis_stats(db)
+    if not db.execute('SELECT 1 FROM resume_signatures LIMIT 1').fetchone():
+        for row in db.execute('SELECT id, user_id, content FROM resume_documents').fetchall():
+            store_resume_signature(db, row['id'], row['user_id'], dedup.minhash(row['content']))
     db.commit()
     db.close()
     logger.info("✓ Database initialized")
 
-with app.app_context():
-    init_db()
+def record_keyword_misses(db, user_id, keywords):
+    db.executemany(
+        'INSERT INTO keyword_misses (user_id, keyword, misses) VALUES (?, ?, 1) '
+        'ON CONFLICT(user_id, keyword) DO UPDATE SET misses = misses + 1',
+        [(user_id, kw) for kw in keywords if kw]
+    )
+
+def store_resume_text(db, user_id, analysis_id, filename, text):
+    cursor = db.execute(
+        'INSERT INTO resume_documents (user_id, analysis_id, filename, content) VALUES (?, ?, ?, ?)',
+        (user_id, analysis_id, filename, text)
+    )
+    return cursor.lastrowid
+
+def store_job_description(db, user_id, text):
+    """Returns (job_id, is_new). Identical JDs are stored once"""
+    content_hash = hashlib.sha256(text.encode()).hexdigest()
+    cursor = db.execute('INSERT OR IGNORE INTO job_descriptions (user_id, content_hash, content) VALUES (?, ?, ?)',
+                        (user_id, content_hash, text))
+    if cursor.rowcount:
+        return cursor.lastrowid, True
+    return db.execute('SELECT id FROM job_descriptions WHERE content_hash = ?', (content_hash,)).fetchone()['id'], False
+
+def store_resume_signature(db, resume_doc_id, user_id, signature):
+    db.execute('INSERT OR REPLACE INTO resume_signatures (resume_doc_id, user_id, signature) VALUES (?, ?, ?)',
+               (resume_doc_id, user_id, dedup.to_blob(signature)))
+    db.executemany('INSERT INTO resume_lsh_bands (band, hash, resume_doc_id, user_id) VALUES (?, ?, ?, ?)',
+                   [(band, h, resume_doc_id, user_id) for band, h in enumerate(dedup.band_hashes(signature))])
+
+def find_near_duplicates(db, signature, user_id=None, threshold=None):
+    """[(resume_doc_id, similarity)] for stored resumes colliding in any LSH band, most similar/newest first"""
+    threshold = dedup.DUPLICATE_THRESHOLD if threshold is None else threshold
+    keys = list(enumerate(dedup.band_hashes(signature)))
+    sql = ('SELECT DISTINCT b.resume_doc_id, s.signature FROM resume_lsh_bands b '
+           'JOIN resume_signatures s ON s.resume_doc_id = b.resume_doc_id WHERE (' +
+           ' OR '.join(['(b.band = ? AND b.hash = ?)'] * len(keys)) + ')')
+    params = [v for key in keys for v in key]
+    if user_id is not None:
+        sql += ' AND b.user_id = ?'
+        params.append(user_id)
+    matches = [(r['resume_doc_id'], dedup.similarity(signature, dedup.from_blob(r['signature'])))
+               for r in db.execute(sql, params)]
+    return sorted([m for m in matches if m[1] >= threshold], key=lambda m: (-m[1], -m[0]))
+
+def find_duplicate_clusters(db, threshold=None):
+    """Group all stored resumes into near-duplicate clusters (bulk recruiter runs)"""
+    threshold = dedup.DUPLICATE_THRESHOLD if threshold is None else threshold
+    pairs = db.execute('SELECT DISTINCT a.resume_doc_id AS a_id, b.resume_doc_id AS b_id FROM resume_lsh_bands a '
+                       'JOIN resume_lsh_bands b ON a.band = b.band AND a.hash = b.hash AND a.resume_doc_id < b.resume_doc_id').fetchall()
+    if not pairs:
+        return []
+    ids = {r['a_id'] for r in pairs} | {r['b_id'] for r in pairs}
+    signatures = {r['resume_doc_id']: dedup.from_blob(r['signature']) for r in db.execute(
+        f"SELECT resume_doc_id, signature FROM resume_signatures WHERE resume_doc_id IN ({','.join('?' * len(ids))})", list(ids))}
+
+    parent = {}
+    def root(i):
+        while parent.get(i, i) != i:
+            i = parent[i]
+        return i
+    for r in pairs:
+        a, b = r['a_id'], r['b_id']
+        if a in signatures and b in signatures and dedup.similarity(signatures[a], signatures[b]) >= threshold:
+            parent[root(b)] = root(a)
+
+    clusters = {}
+    for i in parent:
+        clusters.setdefault(root(i), set()).add(i)
+    for r in list(clusters):
+        clusters[r].add(r)
+    return [sorted(c) for c in clusters.values()]
+
+def load_generated_sections(user_id, fingerprints):
+    if not fingerprints:
+        return {}
+    db = get_db()
+    rows = db.execute(f"SELECT fingerprint, content FROM generated_sections WHERE user_id = ? AND fingerprint IN ({','.join('?' * len(fingerprints))})",
+                      [user_id] + list(fingerprints)).fetchall()
+    db.close()
+    return {r['fingerprint']: json.loads(r['content']) for r in rows}
+
+def save_generated_sections(user_id, items):
+    """items: [(fingerprint, result)]"""
+    db = get_db()
+    db.executemany('INSERT OR REPLACE INTO generated_sections (user_id, fingerprint, content) VALUES (?, ?, ?)',
+                   [(user_id, fp, json.dumps(result)) for fp, result in items])
+    db.commit()
+    db.close()
+
+def summarize_changes(old_text, new_text, limit=10):
+    old_lines = [l.strip() for l in old_text.split('\n') if l.strip()]
+    new_lines = [l.strip() for l in new_text.split('\n') if l.strip()]
+    diff = list(difflib.ndiff(old_lines, new_lines))
+    return {
+        'added': [d[2:] for d in diff if d.startswith('+ ')][:limit],
+        'removed': [d[2:] for d in diff if d.startswith('- ')][:limit]
+    }
+
+_match_indexes = {}
+shared_cache = shared_state.SharedCache()
+
+def get_match_index(kind):
+    """Memory-mapped vector index for 'resume' or 'job'. On first use per process, any stored rows
+    missing from it (new index, or an incremental add that failed) are backfilled under its file lock"""
+    if kind not in _match_indexes:
+        index = matching.VectorIndex(os.path.join(MATCH_INDEX_DIR, kind))
+        table = 'resume_documents' if kind == 'resume' else 'job_descriptions'
+
+        def load_missing(indexed):
+            db = get_db()
+            try:
+                missing = [r['id'] for r in db.execute(f'SELECT id FROM {table} ORDER BY id') if r['id'] not in indexed]
+                rows = []
+                for i in range(0, len(missing), 500):
+                    chunk = missing[i:i + 500]
+                    rows += db.execute(f"SELECT id, content FROM {table} WHERE id IN ({','.join('?' * len(chunk))}) ORDER BY id", chunk).fetchall()
+            finally:
+                db.close()
+            return [r['id'] for r in rows], [matching.embed(r['content']) for r in rows]
+
+        added = index.add_missing(load_missing)
+        if added:
+            logger.info(f"✓ Match index '{kind}' backfilled: {added} rows")
+        _match_indexes[kind] = index
+    return _match_indexes[kind]
+
+def search_resumes(db, query, user_id=None, limit=20, offset=0):
+    """FTS5 search (supports AND / OR / NOT, "phrases", prefix*) ranked by BM25"""
+    sql = ('SELECT d.id, d.user_id, d.analysis_id, d.filename, d.created_at, bm25(resume_fts) AS rank, '
+           "snippet(resume_fts, 1, char(2), char(3), '…', 16) AS snippet "
+           'FROM resume_fts JOIN resume_documents d ON d.id = resume_fts.rowid WHERE resume_fts MATCH ?')
+    params = [query]
+    if user_id is not None:
+        sql += ' AND d.user_id = ?'
+        params.append(user_id)
+    sql += ' ORDER BY rank LIMIT ? OFFSET ?'
+    params += [limit, offset]
+    results = [dict(r) for r in db.execute(sql, params).fetchall()]
+    for r in results:
+        # Resume text is user content: escape it, then turn the match markers into <mark> tags
+        r['snippet'] = html.escape(r['snippet'] or '').replace('\x02', '<mark>').replace('\x03', '</mark>')
+    return results
+
+def rebuild_analysis_stats(db):
+    """Recompute all summary tables from analyses (one full scan)"""
+    db.executescript('''
+        DELETE FROM score_buckets;
+        DELETE FROM template_stats;
+        DELETE FROM keyword_misses;
+        INSERT INTO score_buckets (user_id, kind, bucket, count)
+            SELECT user_id, 'original', MIN(original_score / 10, 9), COUNT(*) FROM analyses
+            WHERE original_score IS NOT NULL GROUP BY 1, 3;
+        INSERT INTO score_buckets (user_id, kind, bucket, count)
+            SELECT user_id, 'improved', MIN(improved_score / 10, 9), COUNT(*) FROM analyses
+            WHERE improved_score IS NOT NULL GROUP BY 1, 3;
+        INSERT INTO template_stats (user_id, template, runs, improvement_total)
+            SELECT user_id, template_used, COUNT(*), SUM(improved_score - original_score) FROM analyses
+            WHERE improved_score IS NOT NULL AND template_used IS NOT NULL GROUP BY 1, 2;
+    ''')
+    for row in db.execute("SELECT user_id, missing_keywords FROM analyses WHERE missing_keywords IS NOT NULL AND missing_keywords != ''"):
+        record_keyword_misses(db, row['user_id'], row['missing_keywords'].split(','))
+    logger.info("✓ Analysis stats rebuilt")
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -108,6 +468,14 @@ def extract_text_from_pdf(file_path):
         raise Exception("Failed to extract PDF text")
 
 def extract_text_from_docx(file_path):
+    """Streaming extractor (document order, headers/footers, merged cells once); python-docx as fallback"""
+    try:
+        return docx_stream.extract_text(file_path)
+    except Exception as e:
+        logger.warning(f"Streaming DOCX extraction failed ({e}), falling back to python-docx")
+        return extract_text_from_docx_legacy(file_path)
+
+def extract_text_from_docx_legacy(file_path):
     try:
         doc = docx.Document(file_path)
         text = '\n'.join([p.text for p in doc.paragraphs if p.text.strip()])
@@ -208,104 +576,144 @@ def generate_ai_suggestions(resume_text, job_description, score_data):
     
     return suggestions
 
-def generate_resume_with_ai(resume_data, job_description, template_style='professional'):
-    if not groq_client:
-        raise Exception("Groq API not configured. Add GROQ_API_KEY to .env file.")
+def call_groq_json(prompt, max_tokens=4096, usage=None):
+    """One chat completion, parsed as JSON. Token usage is added to the usage dict"""
+    response = get_groq_client().chat.completions.create(
+        model="llama-3.3-70b-versatile",
+        messages=[
+            {"role": "system", "content": "Expert resume writer. Return ONLY valid JSON. No markdown."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.7,
+        max_tokens=max_tokens
+    )
     
-    original_text = resume_data.get('full_text', '')
-    original_name = resume_data.get('name', 'Professional')
-    original_contact = resume_data.get('contact', {})
+    result = response.choices[0].message.content.strip()
+    if usage is not None and getattr(response, 'usage', None):
+        usage['prompt_tokens_actual'] = usage.get('prompt_tokens_actual', 0) + response.usage.prompt_tokens
+        usage['completion_tokens'] = usage.get('completion_tokens', 0) + response.usage.completion_tokens
     
-    contact_email = original_contact.get('emails', ['email@example.com'])[0] if original_contact.get('emails') else 'email@example.com'
-    contact_phone = original_contact.get('phones', ['+1234567890'])[0] if original_contact.get('phones') else '+1234567890'
-    contact_linkedin = original_contact.get('linkedin', [''])[0] if original_contact.get('linkedin') else ''
+    # FIXED: Proper markdown cleanup
+    if "```json" in result:
+        parts = result.split("```json")
+        if len(parts) > 1:
+            result = parts[1].split("```")[0].strip()
+    elif "```" in result:
+        parts = result.split("```")
+        if len(parts) >= 3:
+            result = parts[1].strip()
     
-    prompt = """You are an expert ATS resume writer. IMPROVE this resume using the job description.
-
-**ORIGINAL RESUME:**
-""" + original_text[:3500] + """
-
-**JOB DESCRIPTION:**
-""" + job_description[:1500] + """
-
-**RULES:**
-1. PRESERVE truthful info (names, companies, dates)
-2. FIX grammar and spelling
-3. ADD keywords from JD naturally
-4. ENHANCE bullets with action verbs + metrics
-5. Include LinkedIn if available
-6. Add Languages section if mentioned
-
-**RETURN THIS JSON (NO MARKDOWN, NO CODE BLOCKS):**
-{
-    "name": \"""" + original_name + """\",
-    "contact": {
-        "email": \"""" + contact_email + """\",
-        "phone": \"""" + contact_phone + """\",
-        "location": "City, State",
-        "linkedin": \"""" + contact_linkedin + """\"
-    },
-    "summary": "2-3 sentences with years of experience, key skills matching JD, quantifiable achievements.",
-    "experience": [
-        {
-            "title": "Actual Job Title",
-            "company": "Actual Company",
-            "duration": "MM/YYYY - MM/YYYY",
-            "achievements": [
-                "Led project achieving 30% efficiency gain through implementation of X",
-                "Managed team of 5 delivering solutions that increased revenue by $500K",
-                "Optimized process reducing costs by 20% using Y technology"
-            ]
-        }
-    ],
-    "education": [
-        {"degree": "Actual Degree", "institution": "Actual School", "year": "YYYY", "gpa": "X.X (if mentioned)"}
-    ],
-    "skills": ["Skill1", "Skill2", "Skill3"],
-    "certifications": ["Actual Cert 1", "Actual Cert 2"],
-    "languages": ["English (Native)", "Spanish (Fluent)"],
-    "projects": ["Project name: Description with impact metrics"]
-}
-
-QUALITY: Use strong action verbs (Led, Achieved, Implemented). Add metrics (%, $, numbers). Keep bullets 10-20 words. Match JD keywords."""
+    try:
+        return json.loads(result)
+    except json.JSONDecodeError:
+        logger.error(f"Response preview: {result[:500]}")
+        raise
+
+def generate_resume_with_ai(resume_data, job_description, template_style='professional', usage=None, mode=None, user_id=None, reuse=True):
+    if not get_groq_client():
+        raise Exception("Groq API not configured. Add GROQ_API_KEY to .env file.")
+    
+    if (mode or current_app.config['GENERATION_MODE']) == 'sections':
+        return generate_resume_by_sections(resume_data, job_description, usage, user_id, reuse)
+    
+    prompt, stats = prompt_builder.build_resume_prompt(
+        resume_data, job_description,
+        current_app.config['PROMPT_RESUME_TOKENS'], current_app.config['PROMPT_JD_TOKENS']
+    )
+    logger.info(f"Prompt: ~{stats['prompt_tokens']} tokens (resume {stats['resume_tokens_original']} -> {stats['resume_tokens']}, JD {stats['jd_tokens_original']} -> {stats['jd_tokens']})")
+    if usage is not None:
+        usage.update(stats, mode='single')
 
     try:
-        response = groq_client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": "Expert resume writer. Return ONLY valid JSON. No markdown."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=4096
-        )
-        
-        result = response.choices[0].message.content.strip()
-        
-        # FIXED: Proper markdown cleanup
-        if "```json" in result:
-            parts = result.split("```json")
-            if len(parts) > 1:
-                result = parts[1].split("```")[0].strip()
-        elif "```" in result:
-            parts = result.split("```")
-            if len(parts) >= 3:
-                result = parts[1].strip()
-        
-        resume_content = json.loads(result)
+        resume_content = call_groq_json(prompt, 4096, usage)
         logger.info(f"✓ Resume enhanced: {len(resume_content.get('experience', []))} jobs")
         return resume_content
         
     except json.JSONDecodeError as e:
         logger.error(f"JSON parse error: {e}")
-        logger.error(f"Response preview: {result[:500]}")
         raise Exception("AI returned invalid JSON. Please try again.")
     except Exception as e:
         logger.error(f"AI generation error: {e}")
         raise Exception(f"Resume generation failed: {str(e)}")
 
+def generate_resume_by_sections(resume_data, job_description, usage=None, user_id=None, reuse=True):
+    """Generate summary, each experience entry, skills and projects as concurrent Groq calls, then merge.
+
+    With a user_id, sections whose input fingerprint was generated before are reused, not re-sent.
+    """
+    prompts, stats = prompt_builder.build_section_prompts(
+        resume_data, job_description,
+        current_app.config['PROMPT_RESUME_TOKENS'], current_app.config['PROMPT_JD_TOKENS']
+    )
+    if not any(p[0].startswith('experience:') for p in prompts):
+        logger.info("No experience entries parsed - falling back to single-call generation")
+        return generate_resume_with_ai(resume_data, job_description, usage=usage, mode='single')
+    
+    parts = {}
+    if user_id is not None and reuse:
+        cached = load_generated_sections(user_id, [p[3] for p in prompts])
+        parts = {key: cached[fp] for key, _, _, fp in prompts if fp in cached}
+    pending = [p for p in prompts if p[0] not in parts]
+    
+    logger.info(f"Generating {len(pending)}/{len(prompts)} sections concurrently, {len(parts)} reused")
+    if usage is not None:
+        usage.update(stats, mode='sections')
+        usage['prompt_tokens'] = sum(prompt_builder.estimate_tokens(p[1]) for p in pending)
+        usage['regenerated'] = [p[0] for p in pending]
+        usage['reused_sections'] = sorted(parts)
+    
+    retries = current_app.config['GENERATION_RETRIES']
+    
+    def run(key, prompt, max_tokens, fp):
+        section_usage = {}
+        for attempt in range(retries + 1):
+            try:
+                result = call_groq_json(prompt, max_tokens, section_usage)
+                if not isinstance(result, dict):
+                    raise ValueError("expected a JSON object")
+                return key, fp, result, section_usage
+            except Exception as e:
+                logger.warning(f"Section {key} failed (attempt {attempt + 1}): {e}")
+                last_error = e
+                if attempt < retries:
+                    time.sleep(0.5 * (attempt + 1))
+        raise Exception(f"section '{key}' failed: {last_error}")
+    
+    start = time.perf_counter()
+    results, errors = [], []
+    with ThreadPoolExecutor(max_workers=current_app.config['GENERATION_WORKERS']) as pool:
+        futures = [pool.submit(run, *p) for p in pending]
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                errors.append(str(e))
+    
+    for key, fp, result, section_usage in results:
+        parts[key] = result
+        if usage is not None:
+            for k, v in section_usage.items():
+                usage[k] = usage.get(k, 0) + v
+    # Saved even when another section failed, so a retry only pays for the failed ones
+    if user_id is not None and results:
+        save_generated_sections(user_id, [(fp, result) for _, fp, result, _ in results])
+    if errors:
+        logger.error(f"AI generation error: {'; '.join(errors)} ({len(results)} sections saved)")
+        raise Exception(f"Resume generation failed: {'; '.join(errors)}")
+    
+    resume_content = prompt_builder.merge_sections(resume_data, parts)
+    logger.info(f"✓ Resume enhanced: {len(resume_content['experience'])} jobs in {time.perf_counter() - start:.1f}s")
+    return resume_content
+
 def create_resume_pdf(resume_content, template_style, filename):
     """FIXED PDF generation - matches preview exactly"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, HRFlowable
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+    
     try:
         pdf = SimpleDocTemplate(
             filename, 
@@ -489,23 +897,24 @@ def create_resume_pdf(resume_content, template_style, filename):
         return False
 
 # API ROUTES
-FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend')
+def serve_static_page(name):
+    assets = current_app.extensions['static_assets']
+    asset = static_assets.refresh_if_changed(assets, name) if current_app.debug else assets.get(name)
+    if not asset:
+        return None
+    return static_assets.serve(asset, request, current_app.config['STATIC_MAX_AGE'])
 
-@app.route('/')
+@bp.route('/')
+@limiter.exempt
 def home():
-    try:
-        return send_file(os.path.join(FRONTEND_DIR, '1-login.html'))
-    except:
-        return jsonify({'error': 'Frontend not found'}), 404
+    return serve_static_page('1-login.html') or (jsonify({'error': 'Frontend not found'}), 404)
 
-@app.route('/<int:step>-<page>.html')
+@bp.route('/<int:step>-<page>.html')
+@limiter.exempt
 def serve_page(step, page):
-    try:
-        return send_file(os.path.join(FRONTEND_DIR, f"{step}-{page}.html"))
-    except:
-        return jsonify({'error': 'Page not found'}), 404
+    return serve_static_page(f"{step}-{page}.html") or (jsonify({'error': 'Page not found'}), 404)
 
-@app.route('/api/register', methods=['POST'])
+@bp.route('/api/register', methods=['POST'])
 @limiter.limit("5 per hour")
 def register():
     try:
@@ -534,7 +943,7 @@ def register():
         logger.error(f"Registration error: {e}")
         return jsonify({'error': 'Failed'}), 500
 
-@app.route('/api/login', methods=['POST'])
+@bp.route('/api/login', methods=['POST'])
 @limiter.limit("10 per minute")
 def login():
     try:
@@ -561,12 +970,12 @@ def login():
         logger.error(f"Login error: {e}")
         return jsonify({'error': 'Failed'}), 500
 
-@app.route('/api/logout', methods=['POST'])
+@bp.route('/api/logout', methods=['POST'])
 def logout():
     session.clear()
     return jsonify({'message': 'Success'}), 200
 
-@app.route('/api/check-auth', methods=['GET'])
+@bp.route('/api/check-auth', methods=['GET'])
 def check_auth():
     if 'user_id' in session:
         try:
@@ -579,7 +988,7 @@ def check_auth():
             logger.error(f"Auth check error: {e}")
     return jsonify({'authenticated': False}), 200
 
-@app.route('/api/analyze', methods=['POST'])
+@bp.route('/api/analyze', methods=['POST'])
 @limiter.limit("10 per hour")
 def analyze_resume():
     filepath = None
@@ -600,7 +1009,7 @@ def analyze_resume():
             return jsonify({'error': 'Job description too short'}), 400
         
         filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{filename}")
+        filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{filename}")
         file.save(filepath)
         
         # Extract text
@@ -635,9 +1044,41 @@ def analyze_resume():
              ','.join(score_data['matched_keywords'][:10]), 
              ','.join(score_data['missing_keywords'][:10]))
         )
+        record_keyword_misses(db, session['user_id'], score_data['missing_keywords'][:10])
         session['analysis_id'] = cursor.lastrowid
+        resume_doc_id = store_resume_text(db, session['user_id'], cursor.lastrowid, file.filename, resume_text)
+        job_id, job_is_new = store_job_description(db, session['user_id'], job_description)
+        session['resume_doc_id'] = resume_doc_id
+        session['job_id'] = job_id
+
+        # Near-duplicate of an earlier upload by the same user?
+        signature = dedup.minhash(resume_text)
+        duplicate = None
+        session.pop('duplicate_of', None)
+        dups = find_near_duplicates(db, signature, user_id=session['user_id'])
+        if dups:
+            prev_id, similarity = dups[0]
+            prev = db.execute('SELECT d.analysis_id, d.content, a.original_score FROM resume_documents d '
+                              'LEFT JOIN analyses a ON a.id = d.analysis_id WHERE d.id = ?', (prev_id,)).fetchone()
+            duplicate = {
+                'analysis_id': prev['analysis_id'],
+                'similarity': round(similarity, 3),
+                'previous_score': prev['original_score'],
+                'changes': summarize_changes(prev['content'], resume_text)
+            }
+            session['duplicate_of'] = {'resume_doc_id': prev_id, 'similarity': similarity}
+            logger.info(f"✓ Near-duplicate of resume {prev_id} ({similarity:.2f})")
+        store_resume_signature(db, resume_doc_id, session['user_id'], signature)
         db.commit()
         db.close()
+
+        # Incremental matching index update (non-fatal)
+        try:
+            get_match_index('resume').add(resume_doc_id, matching.embed(resume_text))
+            if job_is_new:
+                get_match_index('job').add(job_id, matching.embed(job_description))
+        except Exception as e:
+            logger.warning(f"Match indexing failed: {e}")
         
         logger.info(f"✓ Analysis complete: {score_data['score']}/100")
         
@@ -651,7 +1092,8 @@ def analyze_resume():
                 'has_phone': score_data['has_phone'], 
                 'sections_found': score_data['sections_found'], 
                 'keyword_match_rate': score_data['keyword_match_rate']
-            }
+            },
+            'duplicate_of': duplicate
         }), 200
         
     except Exception as e:
@@ -660,7 +1102,7 @@ def analyze_resume():
         logger.error(f"Analysis error: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/generate-resume', methods=['POST'])
+@bp.route('/api/generate-resume', methods=['POST'])
 @limiter.limit("5 per hour")
 def generate_resume():
     try:
@@ -674,20 +1116,136 @@ def generate_resume():
         if not resume_data or not job_description:
             return jsonify({'error': 'No data found'}), 400
         
-        logger.info(f"Generating resume with {template_style} template...")
-        resume_content = generate_resume_with_ai(resume_data, job_description, template_style)
+        # Reuse an earlier whole generation only for identical text and the same JD. Near-duplicates
+        # (e.g. one changed date) go through generation, where section reuse resends only what changed
+        resume_doc_id = session.get('resume_doc_id')
+        source_ids = [resume_doc_id]
+        duplicate = session.get('duplicate_of')
+
+        db = get_db()
+        if duplicate and resume_doc_id:
+            texts = {r['id']: r['content'] for r in db.execute('SELECT id, content FROM resume_documents WHERE id IN (?, ?)',
+                                                               (resume_doc_id, duplicate['resume_doc_id']))}
+            if len(texts) == 2 and texts[resume_doc_id] == texts[duplicate['resume_doc_id']]:
+                source_ids.append(duplicate['resume_doc_id'])
+        cached = None
+        usage = {}
+        if not request.json.get('force') and resume_doc_id and session.get('job_id'):
+            cached = db.execute(
+                f"SELECT content FROM generated_resumes WHERE job_id = ? AND resume_doc_id IN ({','.join('?' * len(source_ids))}) ORDER BY id DESC LIMIT 1",
+                [session['job_id']] + source_ids
+            ).fetchone()
+
+        if cached:
+            resume_content = json.loads(cached['content'])
+            logger.info("✓ Reusing previous generation for identical resume")
+        else:
+            logger.info(f"Generating resume with {template_style} template...")
+            mode = request.json.get('mode') if request.json.get('mode') in ('single', 'sections') else None
+            resume_content = generate_resume_with_ai(resume_data, job_description, template_style, usage, mode,
+                                                     user_id=session['user_id'], reuse=not request.json.get('force'))
+            if resume_doc_id:
+                db.execute('INSERT INTO generated_resumes (user_id, resume_doc_id, job_id, content) VALUES (?, ?, ?, ?)',
+                           (session['user_id'], resume_doc_id, session.get('job_id'), json.dumps(resume_content)))
+                db.commit()
+        db.close()
         
         session['generated_resume'] = resume_content
         session['resume_template'] = template_style
+        session['generation_mode'] = None if cached else usage.get('mode')
         
         logger.info("✓ Resume generated successfully")
-        return jsonify({'message': 'Success', 'resume_content': resume_content}), 200
+        return jsonify({'message': 'Success', 'resume_content': resume_content, 'reused': cached is not None, 'usage': usage}), 200
         
     except Exception as e:
         logger.error(f"Generation error: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/download-resume', methods=['POST'])
+@bp.route('/api/regenerate-section', methods=['POST'])
+@limiter.limit("30 per hour")
+def regenerate_section():
+    """Regenerate one section (summary / experience / skills / projects) or one bullet of the current resume.
+
+    Body: {"section": ..., "index": n (experience entry), "bullet": m (optional)}
+    """
+    try:
+        if 'user_id' not in session:
+            return jsonify({'error': 'Auth required'}), 401
+        if not get_groq_client():
+            return jsonify({'error': 'Groq API not configured'}), 503
+        
+        resume_content = session.get('generated_resume')
+        resume_data = session.get('resume_data')
+        job_description = session.get('job_description')
+        if not resume_content or not resume_data or not job_description:
+            return jsonify({'error': 'No resume to edit'}), 400
+        
+        data = request.json or {}
+        section = data.get('section')
+        if section not in ('summary', 'experience', 'skills', 'projects'):
+            return jsonify({'error': 'Invalid section'}), 400
+        try:
+            index = int(data.get('index', 0))
+            bullet = None if data.get('bullet') is None else int(data['bullet'])
+        except (TypeError, ValueError):
+            return jsonify({'error': 'index and bullet must be integers'}), 400
+        if index < 0 or (bullet is not None and bullet < 0):
+            return jsonify({'error': 'index and bullet must not be negative'}), 400
+        if section == 'experience' and index >= len(resume_content.get('experience', [])):
+            return jsonify({'error': 'Experience entry not found'}), 404
+        
+        usage = {}
+        key = f"experience:{index}" if section == 'experience' else section
+        prompts, _ = prompt_builder.build_section_prompts(
+            resume_data, job_description,
+            current_app.config['PROMPT_RESUME_TOKENS'], current_app.config['PROMPT_JD_TOKENS']
+        )
+        match = next((p for p in prompts if p[0] == key), None)
+        if bullet is not None:
+            if section == 'experience':
+                entry = resume_content['experience'][index]
+                bullets, context = entry.setdefault('achievements', []), f"{entry.get('title', '')} at {entry.get('company', '')}"
+            elif section == 'projects':
+                bullets, context = resume_content.setdefault('projects', []), 'Project'
+            else:
+                return jsonify({'error': 'Bullets exist only in experience and projects'}), 400
+            if not 0 <= bullet < len(bullets):
+                return jsonify({'error': 'Bullet not found'}), 404
+            
+            result = call_groq_json(prompt_builder.build_bullet_prompt(bullets[bullet], context, job_description), 200, usage)
+            bullets[bullet] = str(result.get('bullet', '')).strip() or bullets[bullet]
+            if match and session.get('generation_mode') == 'sections':
+                # Keep the section cache in step, or the next generation would bring back the old bullet.
+                # Only section-mode output lines up with the section prompts' entries
+                edited = resume_content['experience'][index] if section == 'experience' else {'projects': bullets}
+                save_generated_sections(session['user_id'], [(match[3], edited)])
+        else:
+            if not match:
+                return jsonify({'error': 'Section not found'}), 404
+            
+            _, prompt, max_tokens, fp = match
+            result = call_groq_json(prompt, max_tokens, usage)
+            prompt_builder.apply_section(resume_content, key, result)
+            save_generated_sections(session['user_id'], [(fp, result)])
+        
+        session['generated_resume'] = resume_content
+        if session.get('resume_doc_id'):
+            db = get_db()
+            db.execute('INSERT INTO generated_resumes (user_id, resume_doc_id, job_id, content) VALUES (?, ?, ?, ?)',
+                       (session['user_id'], session['resume_doc_id'], session.get('job_id'), json.dumps(resume_content)))
+            db.commit()
+            db.close()
+        
+        logger.info(f"✓ Regenerated {section}{'' if bullet is None else f' bullet {bullet}'}")
+        return jsonify({'message': 'Success', 'resume_content': resume_content, 'usage': usage}), 200
+        
+    except json.JSONDecodeError:
+        return jsonify({'error': 'AI returned invalid JSON. Please try again.'}), 502
+    except Exception as e:
+        logger.error(f"Section regeneration error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/download-resume', methods=['POST'])
 def download_resume():
     try:
         if 'user_id' not in session:
@@ -698,7 +1256,7 @@ def download_resume():
             return jsonify({'error': 'No resume to download'}), 400
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{app.config['GENERATED_FOLDER']}/resume_{session['user_id']}_{timestamp}.pdf"
+        filename = f"{current_app.config['GENERATED_FOLDER']}/resume_{session['user_id']}_{timestamp}.pdf"
         
         if create_resume_pdf(resume_content, session.get('resume_template', 'professional'), filename):
             db = get_db()
@@ -718,7 +1276,7 @@ def download_resume():
         logger.error(f"Download error: {e}")
         return jsonify({'error': 'Failed'}), 500
 
-@app.route('/api/recalculate-score', methods=['POST'])
+@bp.route('/api/recalculate-score', methods=['POST'])
 def recalculate_score():
     try:
         if 'user_id' not in session:
@@ -770,40 +1328,259 @@ def recalculate_score():
         logger.error(f"Recalc error: {e}")
         return jsonify({'error': 'Failed'}), 500
 
-@app.route('/api/health', methods=['GET'])
+@bp.route('/api/history', methods=['GET'])
+def analysis_history():
+    """Keyset-paginated analysis history (newest first). Pass next_cursor back as ?before="""
+    try:
+        if 'user_id' not in session:
+            return jsonify({'error': 'Auth required'}), 401
+
+        limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+        before = request.args.get('before', type=int)
+
+        db = get_db()
+        rows = db.execute(
+            'SELECT id, filename, original_score, improved_score, template_used, created_at FROM analyses '
+            'WHERE user_id = ? AND id < ? ORDER BY id DESC LIMIT ?',
+            (session['user_id'], before if before is not None else 2**63 - 1, limit + 1)
+        ).fetchall()
+        db.close()
+
+        items = [dict(r) for r in rows[:limit]]
+        next_cursor = items[-1]['id'] if len(rows) > limit else None
+
+        return jsonify({'items': items, 'next_cursor': next_cursor}), 200
+
+    except Exception as e:
+        logger.error(f"History error: {e}")
+        return jsonify({'error': 'Failed'}), 500
+
+@bp.route('/api/stats', methods=['GET'])
+def analysis_stats():
+    """Aggregate dashboard stats, read from the incrementally maintained summary tables"""
+    try:
+        if 'user_id' not in session:
+            return jsonify({'error': 'Auth required'}), 401
+
+        user_id = session['user_id']
+        top = max(1, min(request.args.get('top', 10, type=int), 50))
+
+        db = get_db()
+        distribution = {kind: [{'range': f"{b * 10}-{b * 10 + 9 if b < 9 else 100}", 'count': 0} for b in range(10)]
+                        for kind in ('original', 'improved')}
+        for row in db.execute('SELECT kind, bucket, count FROM score_buckets WHERE user_id = ?', (user_id,)):
+            distribution[row['kind']][row['bucket']]['count'] = row['count']
+
+        templates = [
+            {'template': r['template'], 'runs': r['runs'], 'avg_improvement': round(r['improvement_total'] / r['runs'], 2)}
+            for r in db.execute('SELECT template, runs, improvement_total FROM template_stats WHERE user_id = ? AND runs > 0 ORDER BY runs DESC', (user_id,))
+        ]
+        missing = [
+            {'keyword': r['keyword'], 'count': r['misses']}
+            for r in db.execute('SELECT keyword, misses FROM keyword_misses WHERE user_id = ? ORDER BY misses DESC, keyword LIMIT ?', (user_id, top))
+        ]
+        db.close()
+
+        return jsonify({
+            'total_analyses': sum(b['count'] for b in distribution['original']),
+            'score_distribution': distribution,
+            'templates': templates,
+            'top_missing_keywords': missing
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Stats error: {e}")
+        return jsonify({'error': 'Failed'}), 500
+
+@bp.route('/api/search', methods=['GET'])
+@limiter.limit("60 per minute")
+def search_stored_resumes():
+    """Full-text search over stored resumes. Recruiters (RECRUITER_EMAILS) may pass scope=all"""
+    try:
+        if 'user_id' not in session:
+            return jsonify({'error': 'Auth required'}), 401
+
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'error': 'Query required'}), 400
+
+        limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+        offset = max(0, request.args.get('offset', 0, type=int))
+        scope_all = request.args.get('scope') == 'all'
+        if scope_all and session.get('user_email') not in RECRUITER_EMAILS:
+            return jsonify({'error': 'Recruiter access required'}), 403
+
+        db = get_db()
+        try:
+            results = search_resumes(db, query, None if scope_all else session['user_id'], limit, offset)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Bad search query {query!r}: {e}")
+            return jsonify({'error': 'Invalid search query'}), 400
+        finally:
+            db.close()
+
+        return jsonify({'results': results, 'count': len(results), 'offset': offset}), 200
+
+    except Exception as e:
+        logger.error(f"Search error: {e}")
+        return jsonify({'error': 'Failed'}), 500
+
+@bp.route('/api/match/candidates', methods=['POST'])
+@limiter.limit("60 per minute")
+def match_candidates():
+    """Top resumes for a job description (recruiters only). Body: job_description or job_id, optional k"""
+    try:
+        if 'user_id' not in session:
+            return jsonify({'error': 'Auth required'}), 401
+        if session.get('user_email') not in RECRUITER_EMAILS:
+            return jsonify({'error': 'Recruiter access required'}), 403
+
+        data = request.json or {}
+        k = max(1, min(int(data.get('k', 50)), 200))
+
+        db = get_db()
+        job_description = (data.get('job_description') or '').strip()
+        if not job_description and data.get('job_id'):
+            row = db.execute('SELECT content FROM job_descriptions WHERE id = ?', (data['job_id'],)).fetchone()
+            job_description = row['content'] if row else ''
+        if not job_description:
+            db.close()
+            return jsonify({'error': 'Job description required'}), 400
+
+        index = get_match_index('resume')
+        if data.get('job_id') and not data.get('job_description'):
+            # Stored jobs get re-ranked repeatedly; cache per index size so new resumes show up
+            hits = shared_cache.get_or_set(f"candidates:{data['job_id']}:{k}:{len(index)}",
+                                           lambda: index.search(matching.embed(job_description), k), SHARED_CACHE_TTL)
+        else:
+            hits = index.search(matching.embed(job_description), k)
+        rows = {}
+        if hits:
+            ids = [h[0] for h in hits]
+            rows = {r['id']: r for r in db.execute(
+                f"SELECT id, user_id, analysis_id, filename, created_at FROM resume_documents WHERE id IN ({','.join('?' * len(ids))})", ids)}
+        db.close()
+
+        candidates = [dict(rows[rid], similarity=round(sim, 4)) for rid, sim in hits if rid in rows]
+        return jsonify({'candidates': candidates}), 200
+
+    except Exception as e:
+        logger.error(f"Candidate match error: {e}")
+        return jsonify({'error': 'Failed'}), 500
+
+@bp.route('/api/match/jobs', methods=['POST'])
+@limiter.limit("60 per minute")
+def match_jobs():
+    """Top stored job descriptions for the current resume (or resume_text in the body)"""
+    try:
+        if 'user_id' not in session:
+            return jsonify({'error': 'Auth required'}), 401
+
+        data = request.json or {}
+        k = max(1, min(int(data.get('k', 20)), 100))
+        resume_text = (data.get('resume_text') or session.get('resume_text') or '').strip()
+        if not resume_text:
+            return jsonify({'error': 'No resume found'}), 400
+
+        hits = get_match_index('job').search(matching.embed(resume_text), k)
+        rows = {}
+        if hits:
+            ids = [h[0] for h in hits]
+            db = get_db()
+            rows = {r['id']: r for r in db.execute(
+                f"SELECT id, content, created_at FROM job_descriptions WHERE id IN ({','.join('?' * len(ids))})", ids)}
+            db.close()
+
+        jobs = [{'job_id': jid, 'similarity': round(sim, 4), 'preview': rows[jid]['content'][:200], 'created_at': rows[jid]['created_at']}
+                for jid, sim in hits if jid in rows]
+        return jsonify({'jobs': jobs}), 200
+
+    except Exception as e:
+        logger.error(f"Job match error: {e}")
+        return jsonify({'error': 'Failed'}), 500
+
+@bp.route('/api/duplicates', methods=['GET'])
+def duplicate_resumes():
+    """Near-duplicate clusters across all stored resumes (recruiters only)"""
+    try:
+        if 'user_id' not in session:
+            return jsonify({'error': 'Auth required'}), 401
+        if session.get('user_email') not in RECRUITER_EMAILS:
+            return jsonify({'error': 'Recruiter access required'}), 403
+
+        threshold = min(max(request.args.get('threshold', dedup.DUPLICATE_THRESHOLD, type=float), 0.5), 1.0)
+        db = get_db()
+        # Full self-join of the LSH bands: shared by all workers until a new resume is stored
+        latest = db.execute('SELECT COALESCE(MAX(resume_doc_id), 0) FROM resume_signatures').fetchone()[0]
+        clusters = shared_cache.get_or_set(f"duplicates:{threshold}:{latest}",
+                                           lambda: find_duplicate_clusters(db, threshold), SHARED_CACHE_TTL)
+        ids = [i for c in clusters for i in c]
+        docs = {}
+        if ids:
+            docs = {r['id']: dict(r) for r in db.execute(
+                f"SELECT id, user_id, analysis_id, filename, created_at FROM resume_documents WHERE id IN ({','.join('?' * len(ids))})", ids)}
+        db.close()
+
+        return jsonify({
+            'threshold': threshold,
+            'clusters': [[docs[i] for i in c if i in docs] for c in clusters]
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Duplicate scan error: {e}")
+        return jsonify({'error': 'Failed'}), 500
+
+@bp.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
-        'groq_configured': groq_client is not None,
+        'groq_configured': bool(GROQ_API_KEY),
+        'process': startup_report(),
         'timestamp': datetime.now().isoformat()
     }), 200
 
 # ERROR HANDLERS
-@app.errorhandler(404)
+@bp.app_errorhandler(404)
 def not_found(e):
     return jsonify({'error': 'Not found'}), 404
 
-@app.errorhandler(413)
+@bp.app_errorhandler(413)
 def file_too_large(e):
     return jsonify({'error': 'File too large (max 5MB)'}), 413
 
-@app.errorhandler(429)
+@bp.app_errorhandler(429)
 def rate_limit_exceeded(e):
     return jsonify({'error': 'Rate limit exceeded'}), 429
 
-@app.errorhandler(500)
+@bp.app_errorhandler(500)
 def internal_error(e):
     logger.error(f"Internal error: {e}")
     return jsonify({'error': 'Server error'}), 500
 
+_startup['import_ms'] = round((time.perf_counter() - _MODULE_START) * 1000, 1)
+
+def __getattr__(name):
+    # `app:app` (gunicorn, flask run, `from app import app`) keeps working; the app is only built on first access
+    if name == 'app':
+        globals()['app'] = create_app()
+        return globals()['app']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 if __name__ == '__main__':
+    if '--startup-report' in sys.argv:
+        create_app(preload=True if '--preload' in sys.argv else None)
+        print(json.dumps(startup_report(), indent=2))
+        sys.exit(0)
+    
+    app = create_app()
     print("\n" + "="*70)
     print("🚀 Smart ATS Resume Checker v4.0 - ALL ERRORS FIXED")
     print("="*70)
     print(f"📍 Server: http://localhost:5000")
     print(f"🤖 AI Engine: Groq (Llama 3.3 70B)")
     print(f"💾 Database: database/ats_checker.db")
+    print(f"🏭 Production: gunicorn -c gunicorn.conf.py wsgi:app (this is the dev server)")
     print("="*70)
     print("✅ ENHANCEMENTS:")
     print("   ✓ Fixed PDF formatting (matches preview exactly)")
@@ -819,7 +1596,7 @@ if __name__ == '__main__':
     
     # Startup checks
     issues = []
-    if not groq_client:
+    if not GROQ_API_KEY:
         issues.append("⚠️  GROQ_API_KEY not configured - AI features disabled")
     if not os.path.exists(app.config['UPLOAD_FOLDER']):
         issues.append(f"⚠️  Creating upload folder: {app.config['UPLOAD_FOLDER']}")
@@ -0,0 +1,75 @@
+"""
+Benchmark: streaming DOCX extractor vs python-docx
+
+Builds a synthetic resume-style .docx (paragraphs, tables with merged cells,
+header/footer), then times both extraction paths and measures peak memory.
+
+Usage: python bench_docx.py [paragraphs] [tables]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+import docx
+import docx_stream
+
+
+def build_docx(path, paragraphs=2000, tables=50):
+    doc = docx.Document()
+    doc.sections[0].header.paragraphs[0].text = "John Smith | john@example.com | +1 555 555 5555"
+    doc.sections[0].footer.paragraphs[0].text = "References available on request"
+    for i in range(paragraphs):
+        doc.add_paragraph(f"Led migration of service {i} to Kubernetes, cutting deploy time by {i % 90}% using Python and Terraform")
+        if tables and i % max(1, paragraphs // tables) == 0:
+            table = doc.add_table(rows=4, cols=4)
+            for r, row in enumerate(table.rows):
+                for c, cell in enumerate(row.cells):
+                    cell.text = f"Skill {i}-{r}-{c}"
+            table.cell(0, 0).merge(table.cell(0, 3))   # horizontal merge
+            table.cell(1, 0).merge(table.cell(3, 0))   # vertical merge
+    doc.save(path)
+
+
+def extract_legacy(path):
+    d = docx.Document(path)
+    text = '\n'.join([p.text for p in d.paragraphs if p.text.strip()])
+    for table in d.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                if cell.text.strip():
+                    text += '\n' + cell.text
+    return text.strip()
+
+
+def measure(fn, path, runs=3):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn(path)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return sorted(times)[len(times) // 2], peak, result
+
+
+if __name__ == "__main__":
+    paragraphs = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    tables = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench.docx')
+    build_docx(path, paragraphs, tables)
+
+    print("=" * 60)
+    print(f"📄 DOCX EXTRACTION BENCHMARK ({paragraphs} paragraphs, {tables} tables, {os.path.getsize(path) // 1024} KB)")
+    print("=" * 60)
+    results = {}
+    for name, fn in (('python-docx', extract_legacy), ('streaming', docx_stream.extract_text)):
+        seconds, peak, text = measure(fn, path)
+        results[name] = seconds
+        print(f"{name:<12} {seconds * 1000:8.1f} ms   peak {peak / 1048576:6.1f} MB   {len(text.splitlines()):6d} lines")
+    print("-" * 60)
+    print(f"Speedup: {results['python-docx'] / results['streaming']:.1f}x")
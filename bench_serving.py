@@ -0,0 +1,141 @@
+"""
+Benchmark: multi-process serving throughput (gunicorn, 1..N workers)
+
+Seeds a scratch database with stored job descriptions, then for each worker
+count starts `gunicorn -c gunicorn.conf.py wsgi:app` and drives POST
+/api/match/jobs (embedding + vector search: CPU-bound, holds the GIL) from
+several client processes. Rate limiting is switched off for the run.
+
+Usage: python bench_serving.py [max_workers] [seconds] [jobs]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import socket
+import tempfile
+import subprocess
+import http.client
+from multiprocessing import Pool
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SKILLS = ['python', 'django', 'flask', 'kubernetes', 'terraform', 'aws', 'react', 'typescript', 'postgresql',
+          'kafka', 'spark', 'airflow', 'docker', 'golang', 'java', 'spring', 'redis', 'graphql', 'ml', 'pytorch']
+
+
+def fake_text(rng, words=250):
+    return ' '.join(rng.choice(SKILLS) if rng.random() < 0.3 else f"word{rng.randrange(3000)}" for _ in range(words))
+
+
+def seed(workdir, jobs):
+    script = (
+        'import random, app\n'
+        'from bench_serving import fake_text\n'
+        'flask_app = app.create_app()\n'
+        'db = app.get_db(); rng = random.Random(7)\n'
+        f'for _ in range({jobs}): app.store_job_description(db, None, fake_text(rng))\n'
+        'db.commit(); db.close()\n'
+    )
+    subprocess.run([sys.executable, '-c', script], cwd=workdir, env=server_env(), check=True, capture_output=True)
+
+
+def server_env(**extra):
+    env = dict(os.environ, PYTHONPATH=ROOT, FRONTEND_DIR=ROOT, RATELIMIT_ENABLED='0', GROQ_API_KEY='')
+    env.update(extra)
+    return env
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def request(conn, method, path, body=None, cookie=None):
+    headers = {'Content-Type': 'application/json'}
+    if cookie:
+        headers['Cookie'] = cookie
+    conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+    response = conn.getresponse()
+    response.read()
+    return response
+
+
+def wait_ready(port, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            request(http.client.HTTPConnection('127.0.0.1', port, timeout=2), 'GET', '/api/health')
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('server did not start')
+
+
+def login(port):
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    user = {'name': 'Bench', 'email': 'bench@example.com', 'password': 'benchmark'}
+    request(conn, 'POST', '/api/register', user)
+    response = request(conn, 'POST', '/api/login', user)
+    return response.getheader('Set-Cookie').split(';')[0]
+
+
+def client(args):
+    port, cookie, seconds, seed_value = args
+    rng = random.Random(seed_value)
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    latencies, errors = [], 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        started = time.perf_counter()
+        try:
+            status = request(conn, 'POST', '/api/match/jobs', {'resume_text': fake_text(rng, 600), 'k': 20}, cookie).status
+        except (OSError, http.client.HTTPException):
+            conn, status = http.client.HTTPConnection('127.0.0.1', port), None
+        if status == 200:
+            latencies.append(time.perf_counter() - started)
+        else:
+            errors += 1
+    return latencies, errors
+
+
+def run(workdir, workers, seconds, clients):
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', os.path.join(ROOT, 'gunicorn.conf.py'), '--access-logfile', '/dev/null', 'wsgi:app'],
+        cwd=workdir, env=server_env(WEB_WORKERS=str(workers), BIND=f'127.0.0.1:{port}'),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_ready(port)
+        cookie = login(port)
+        with Pool(clients) as pool:
+            results = pool.map(client, [(port, cookie, seconds, i) for i in range(clients)])
+    finally:
+        server.terminate()
+        server.wait()
+    latencies = sorted(l for r in results for l in r[0])
+    errors = sum(r[1] for r in results)
+    pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0
+    return len(latencies) / seconds, pct(0.5), pct(0.95), errors
+
+
+if __name__ == "__main__":
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else cores
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    jobs = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+
+    workdir = tempfile.mkdtemp()
+    seed(workdir, jobs)
+
+    print("=" * 60)
+    print(f"🏭 SERVING BENCHMARK ({cores} cores, {jobs} stored jobs, {seconds:.0f}s per run, POST /api/match/jobs)")
+    print("=" * 60)
+    baseline = None
+    for workers in range(1, max_workers + 1):
+        rps, p50, p95, errors = run(workdir, workers, seconds, clients=max(4, 2 * workers))
+        baseline = baseline or rps
+        print(f"{workers:2d} workers   {rps:8.1f} req/s   p50 {p50:7.1f} ms   p95 {p95:7.1f} ms   "
+              f"x{rps / baseline:4.2f}   errors {errors}")
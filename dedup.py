@@ -0,0 +1,65 @@
+"""
+Near-Duplicate Resume Detection
+
+MinHash signatures over word shingles plus banded LSH keys. Two resumes that
+differ by a changed date or an extra bullet share most shingles, so their
+signatures agree in most positions and they collide in at least one band.
+"""
+
+import re
+import zlib
+import hashlib
+from functools import lru_cache
+import numpy as np
+
+SHINGLE_SIZE = 4
+NUM_PERM = 128
+BANDS = 16                      # 16 bands x 8 rows -> candidate threshold ~0.71 Jaccard
+ROWS = NUM_PERM // BANDS
+DUPLICATE_THRESHOLD = 0.85      # estimated Jaccard to call two resumes near-duplicates
+_PRIME = (1 << 31) - 1
+
+
+@lru_cache(maxsize=1)
+def _permutations():
+    rng = np.random.default_rng(2024)
+    a = rng.integers(1, _PRIME, size=NUM_PERM, dtype=np.uint64)
+    b = rng.integers(0, _PRIME, size=NUM_PERM, dtype=np.uint64)
+    return a[:, None], b[:, None]
+
+
+def shingles(text):
+    words = re.findall(r'\w+', (text or '').lower())
+    if len(words) < SHINGLE_SIZE:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(text):
+    """NUM_PERM-value MinHash signature (uint32) of the text's word shingles"""
+    items = shingles(text)
+    if not items:
+        return np.full(NUM_PERM, _PRIME, dtype=np.uint32)
+    x = np.fromiter((zlib.crc32(s.encode()) & _PRIME for s in items), dtype=np.uint64, count=len(items))
+    a, b = _permutations()
+    return ((a * x[None, :] + b) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+def band_hashes(signature):
+    """One signed 64-bit key per band, suitable for an SQLite INTEGER column"""
+    sig = np.asarray(signature, dtype=np.uint32)
+    return [int.from_bytes(hashlib.blake2b(sig[i * ROWS:(i + 1) * ROWS].tobytes(), digest_size=8).digest(), 'little', signed=True)
+            for i in range(BANDS)]
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.mean(np.asarray(sig_a) == np.asarray(sig_b)))
+
+
+def to_blob(signature):
+    return np.asarray(signature, dtype=np.uint32).tobytes()
+
+
+def from_blob(blob):
+    return np.frombuffer(blob, dtype=np.uint32)
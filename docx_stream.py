@@ -0,0 +1,104 @@
+"""
+Streaming DOCX Text Extractor
+
+Reads word/document.xml (plus headers and footers) straight out of the ZIP with
+an incremental XML parser instead of building the python-docx object model.
+Paragraphs and table cells come out in document order, merged cells once, and
+parsed elements are discarded as we go so memory stays flat on large files.
+"""
+
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+_P, _T, _TAB, _BR, _CR = W + 'p', W + 't', W + 'tab', W + 'br', W + 'cr'
+_TC, _TBL, _BODY, _VMERGE = W + 'tc', W + 'tbl', W + 'body', W + 'vMerge'
+
+
+def _part_order(name):
+    return int(re.sub(r'\D', '', name) or 0)
+
+
+def iter_part_lines(stream):
+    """Yield non-empty paragraph / table-cell texts of one WordprocessingML part, in order"""
+    paragraphs = []   # stack: text boxes put paragraphs inside paragraphs
+    cells = []        # stack of [paragraph texts, is_vmerge_continuation]
+    fallback = 0      # mc:Fallback repeats the mc:Choice content (text boxes) - skip it
+    container = None  # element whose finished children we drop to keep memory flat
+    tables = 0
+
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            if fallback and tag != MC_FALLBACK:
+                continue            # ends inside the Fallback are skipped too, so keep the stacks balanced
+            if tag == _P:
+                paragraphs.append([])
+            elif tag == _TC:
+                cells.append([[], False])
+            elif tag == _TBL:
+                tables += 1
+            elif tag == MC_FALLBACK:
+                fallback += 1
+            elif container is None and tag in (_BODY, W + 'hdr', W + 'ftr'):
+                container = elem
+            continue
+
+        if tag == MC_FALLBACK:
+            fallback -= 1
+        elif fallback:
+            pass
+        elif tag == _T and paragraphs:
+            paragraphs[-1].append(elem.text or '')
+        elif tag == _TAB and paragraphs:
+            paragraphs[-1].append('\t')
+        elif tag in (_BR, _CR) and paragraphs:
+            paragraphs[-1].append('\n')
+        elif tag == _VMERGE and cells and elem.get(W + 'val', 'continue') == 'continue':
+            cells[-1][1] = True
+        elif tag == _P and paragraphs:
+            text = ''.join(paragraphs.pop())
+            if paragraphs:
+                paragraphs[-1].append(text)   # text box: fold into the enclosing paragraph
+            elif cells:
+                if text.strip():
+                    cells[-1][0].append(text)
+            elif text.strip():
+                yield text
+        elif tag == _TC and cells:
+            cell_paragraphs, continuation = cells.pop()
+            text = '\n'.join(cell_paragraphs)
+            if continuation or not text.strip():
+                pass
+            elif cells:
+                cells[-1][0].append(text)   # nested table: keep its text inside the enclosing cell, in order
+            else:
+                yield text
+        elif tag == _TBL:
+            tables -= 1
+
+        if tag in (_P, _TBL) and not tables and not cells and not paragraphs and container is not None:
+            container.clear()
+
+
+def extract_text(file_path):
+    """Headers, body and footers of a .docx as newline-separated text"""
+    with zipfile.ZipFile(file_path) as zf:
+        names = zf.namelist()
+        headers = sorted((n for n in names if re.fullmatch(r'word/header\d*\.xml', n)), key=_part_order)
+        footers = sorted((n for n in names if re.fullmatch(r'word/footer\d*\.xml', n)), key=_part_order)
+        lines = []
+        seen_header_footer = set()
+        for part in headers + ['word/document.xml'] + footers:
+            with zf.open(part) as stream:
+                for line in iter_part_lines(stream):
+                    # Section headers/footers are usually repeated copies (first page / even / default)
+                    if part != 'word/document.xml':
+                        if line in seen_header_footer:
+                            continue
+                        seen_header_footer.add(line)
+                    lines.append(line)
+    return '\n'.join(lines).strip()
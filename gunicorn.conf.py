@@ -0,0 +1,25 @@
+"""
+gunicorn settings:  gunicorn -c gunicorn.conf.py wsgi:app
+
+Sizing: text extraction, scoring, PDF rendering and matching are CPU-bound and
+hold the GIL, so we run one worker process per core; each worker gets a few
+threads to overlap requests blocked on Groq. Rate limits and shared caches
+live in database/shared_state.db, so the worker count doesn't change them.
+
+Environment: BIND, WEB_WORKERS, WEB_THREADS, WEB_TIMEOUT, WEB_MAX_REQUESTS
+"""
+
+import os
+
+bind = os.getenv('BIND', '0.0.0.0:5000')
+cores = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+workers = int(os.getenv('WEB_WORKERS', 0)) or cores
+worker_class = 'gthread'
+threads = int(os.getenv('WEB_THREADS', 4))
+preload_app = True
+timeout = int(os.getenv('WEB_TIMEOUT', 120))        # AI generation can take tens of seconds
+graceful_timeout = 30
+keepalive = 5
+max_requests = int(os.getenv('WEB_MAX_REQUESTS', 5000))
+max_requests_jitter = 500
+accesslog = '-'
@@ -0,0 +1,268 @@
+"""
+Resume <-> Job Matching Index
+
+Turns resumes and job descriptions into fixed-size vectors with a hashing
+vectorizer + sparse random projection (NumPy only - no model download, no GPU),
+keeps them in memory-mapped arrays and answers top-k queries with
+random-hyperplane LSH followed by exact cosine re-ranking.
+"""
+
+import os
+import re
+import json
+import zlib
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+DIM = 256                   # embedding size
+N_FEATURES = 1 << 18        # hashing vectorizer space
+PROJ_NNZ = 4                # non-zeros per feature in the sparse projection
+LSH_TABLES = 8
+LSH_BITS = 12
+BRUTE_FORCE_LIMIT = 50000   # below this an exact scan is already milliseconds
+INITIAL_CAPACITY = 1024
+SEED = 1337
+
+STOP_WORDS = {'the', 'and', 'for', 'with', 'this', 'that', 'from', 'have', 'will', 'your', 'our',
+              'are', 'was', 'were', 'you', 'all', 'any', 'can', 'has', 'not', 'but', 'its', 'into'}
+
+_TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+
+
+def _features(text):
+    tokens = [t.rstrip('.') for t in _TOKEN_RE.findall(text.lower())]
+    tokens = [t for t in tokens if len(t) > 1 and t not in STOP_WORDS]
+    for t in tokens:
+        yield zlib.crc32(t.encode()) & (N_FEATURES - 1)
+    for a, b in zip(tokens, tokens[1:]):
+        yield zlib.crc32(f"{a} {b}".encode()) & (N_FEATURES - 1)
+
+
+@lru_cache(maxsize=1)
+def _projection():
+    """Very sparse random projection: each hashed feature maps to PROJ_NNZ signed output dims"""
+    rng = np.random.default_rng(SEED)
+    dims = rng.integers(0, DIM, size=(N_FEATURES, PROJ_NNZ), dtype=np.int32)
+    signs = rng.choice(np.array([-1.0, 1.0], dtype=np.float32), size=(N_FEATURES, PROJ_NNZ))
+    return dims, signs
+
+
+@lru_cache(maxsize=1)
+def _hyperplanes():
+    rng = np.random.default_rng(SEED + 1)
+    return rng.standard_normal((LSH_TABLES * LSH_BITS, DIM)).astype(np.float32)
+
+
+def embed(text):
+    """L2-normalised DIM-dimensional vector for a resume or job description"""
+    counts = {}
+    for f in _features(text or ''):
+        counts[f] = counts.get(f, 0) + 1
+    if not counts:
+        return np.zeros(DIM, dtype=np.float32)
+
+    ids = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    weights = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+    dims, signs = _projection()
+    vec = np.bincount(dims[ids].ravel(), weights=(signs[ids] * weights[:, None]).ravel(), minlength=DIM)
+    vec = vec.astype(np.float32)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+def lsh_codes(vecs):
+    """One LSH_BITS-bit bucket code per table for each row of vecs"""
+    vecs = np.atleast_2d(vecs)
+    bits = (vecs @ _hyperplanes().T > 0).reshape(len(vecs), LSH_TABLES, LSH_BITS)
+    return (bits * (1 << np.arange(LSH_BITS, dtype=np.uint16))).sum(axis=2).astype(np.uint16)
+
+
+class VectorIndex:
+    """Append-only vector store on memory-mapped files with an LSH index.
+
+    Files: <prefix>.vec (float32 rows), <prefix>.ids (int64 external ids),
+    <prefix>.lsh (uint16 codes) and <prefix>.meta.json (row count / capacity).
+    Several processes may share one index: writers take a file lock and readers
+    pick up rows appended by other workers on their next query.
+    """
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self._lock = threading.RLock()
+        self._count = 0
+        self._capacity = 0
+        self._buckets = [dict() for _ in range(LSH_TABLES)]
+        self._meta_version = None
+        os.makedirs(os.path.dirname(prefix) or '.', exist_ok=True)
+        with self._file_lock():
+            meta = self._read_meta()
+            if meta is None:
+                self._resize_files(INITIAL_CAPACITY)
+                self._write_meta(0, INITIAL_CAPACITY)
+        self._refresh()
+
+    def __len__(self):
+        self._refresh()
+        return self._count
+
+    # --- storage -------------------------------------------------------
+
+    @contextmanager
+    def _file_lock(self):
+        with self._lock, open(self.prefix + '.lock', 'a') as fh:
+            if fcntl:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _read_meta(self):
+        try:
+            with open(self.prefix + '.meta.json') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_meta(self, count, capacity):
+        tmp = self.prefix + '.meta.json.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'count': count, 'capacity': capacity, 'dim': DIM}, f)
+        os.replace(tmp, self.prefix + '.meta.json')
+
+    def _resize_files(self, capacity):
+        for ext, row_bytes in (('.vec', DIM * 4), ('.ids', 8), ('.lsh', LSH_TABLES * 2)):
+            with open(self.prefix + ext, 'ab') as f:
+                f.truncate(capacity * row_bytes)
+
+    def _map(self, capacity):
+        self._vecs = np.memmap(self.prefix + '.vec', dtype=np.float32, mode='r+', shape=(capacity, DIM))
+        self._ids = np.memmap(self.prefix + '.ids', dtype=np.int64, mode='r+', shape=(capacity,))
+        self._codes = np.memmap(self.prefix + '.lsh', dtype=np.uint16, mode='r+', shape=(capacity, LSH_TABLES))
+        self._capacity = capacity
+
+    def _refresh(self):
+        """Map rows appended since the last call (possibly by another process)"""
+        try:
+            st = os.stat(self.prefix + '.meta.json')
+        except FileNotFoundError:
+            return
+        version = (st.st_ino, st.st_mtime_ns)  # os.replace() gives every write a new inode
+        with self._lock:
+            if version == self._meta_version:
+                return
+            meta = self._read_meta()
+            if meta is None:
+                return
+            if meta['capacity'] != self._capacity:
+                self._map(meta['capacity'])
+            for row in range(self._count, meta['count']):
+                for table, code in enumerate(self._codes[row]):
+                    self._buckets[table].setdefault(int(code), []).append(row)
+            self._count = meta['count']
+            self._meta_version = version
+
+    # --- public API ----------------------------------------------------
+
+    def add(self, ext_id, vec):
+        self.add_many([ext_id], np.asarray(vec, dtype=np.float32)[None, :])
+
+    def add_many(self, ext_ids, vecs):
+        vecs = np.asarray(vecs, dtype=np.float32).reshape(-1, DIM)
+        if not len(vecs):
+            return
+        with self._file_lock():
+            self._meta_version = None
+            self._refresh()
+            self._append(ext_ids, vecs)
+
+    def add_missing(self, load_rows):
+        """Append the rows this index lacks. load_rows(indexed_ids) -> (ext_ids, vecs) for ids not in the set.
+
+        Runs under the file lock, so workers backfilling at the same time don't add the same rows twice.
+        """
+        with self._file_lock():
+            self._meta_version = None
+            self._refresh()
+            ext_ids, vecs = load_rows(set(self._ids[:self._count].tolist()))
+            if len(ext_ids):
+                self._append(ext_ids, np.asarray(vecs, dtype=np.float32).reshape(-1, DIM))
+            return len(ext_ids)
+
+    def _append(self, ext_ids, vecs):
+        """Write rows after the current end; caller holds the file lock. Ids already present are skipped"""
+        ext_ids = np.asarray(ext_ids, dtype=np.int64)
+        new = ~np.isin(ext_ids, self._ids[:self._count])
+        ext_ids, vecs = ext_ids[new], vecs[new]
+        if not len(ext_ids):
+            return
+        start, end = self._count, self._count + len(vecs)
+        if end > self._capacity:
+            capacity = self._capacity
+            while capacity < end:
+                capacity *= 2
+            self._vecs.flush()
+            self._resize_files(capacity)
+            self._map(capacity)
+        self._vecs[start:end] = vecs
+        self._ids[start:end] = ext_ids
+        self._codes[start:end] = lsh_codes(vecs)
+        for m in (self._vecs, self._ids, self._codes):
+            m.flush()
+        self._write_meta(end, self._capacity)
+        self._meta_version = None
+        self._refresh()
+
+    def _candidates(self, query):
+        codes = lsh_codes(query)[0]
+        rows = set()
+        for table, code in enumerate(codes):
+            buckets = self._buckets[table]
+            rows.update(buckets.get(int(code), ()))
+            for bit in range(LSH_BITS):  # multi-probe: neighbouring buckets at Hamming distance 1
+                rows.update(buckets.get(int(code) ^ (1 << bit), ()))
+        return np.fromiter(rows, dtype=np.int64, count=len(rows))
+
+    def search(self, query, k=50, exclude_ids=()):
+        """Top-k (external_id, cosine similarity) pairs, best first"""
+        self._refresh()
+        n = self._count
+        if n == 0:
+            return []
+        query = np.asarray(query, dtype=np.float32)
+        want = k + len(exclude_ids)
+
+        rows = None
+        if n > BRUTE_FORCE_LIMIT:
+            rows = self._candidates(query)
+            if len(rows) < want * 4:
+                rows = None  # too few candidates to trust - fall back to an exact scan
+        if rows is None:
+            scores = self._vecs[:n] @ query
+            rows = np.arange(n)
+        else:
+            rows.sort()
+            scores = self._vecs[rows] @ query
+
+        top = min(len(rows), want * 2)
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best])]
+
+        excluded, results = set(exclude_ids), []
+        for i in best:
+            ext_id = int(self._ids[rows[i]])
+            if ext_id in excluded:
+                continue
+            excluded.add(ext_id)
+            results.append((ext_id, float(scores[i])))
+            if len(results) == k:
+                break
+        return results
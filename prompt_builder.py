@@ -0,0 +1,378 @@
+"""
+Prompt Builder - section-aware compaction for the Groq resume prompt
+
+Instead of blindly cutting the resume at 3500 chars, the resume is split into
+sections, cleaned (whitespace, bullet glyphs, duplicate lines), ranked against
+the job description's keywords and packed into a token budget. Job titles /
+companies / dates are always kept so later experience entries are never lost.
+"""
+
+import re
+import math
+import hashlib
+from collections import Counter
+
+STOP_WORDS = {'the', 'and', 'for', 'with', 'this', 'that', 'from', 'have', 'will', 'your', 'our'}
+
+SECTION_PATTERNS = [
+    ('summary', r'(professional\s+)?(summary|profile|objective|about\s+me)'),
+    ('experience', r'(professional\s+|work\s+)?(experience|employment(\s+history)?|work\s+history)'),
+    ('education', r'education(al\s+background)?|academics?'),
+    ('skills', r'(technical\s+|core\s+|key\s+)?(skills|competencies|technologies)(\s*&\s*\w+)?'),
+    ('projects', r'(personal\s+|key\s+)?projects?|portfolio'),
+    ('certifications', r'certifications?|certificates?|licenses?(\s*&\s*certifications?)?'),
+    ('languages', r'languages?'),
+    ('other', r'awards?|achievements|honou?rs|publications|volunteer(ing)?(\s+experience)?|interests|activities'),
+]
+_HEADING_RES = [(name, re.compile(rf'^\s*({pattern})\s*:?\s*$', re.IGNORECASE)) for name, pattern in SECTION_PATTERNS]
+
+# Relative value of a non-anchor line when packing the budget
+SECTION_WEIGHTS = {'summary': 2.0, 'skills': 3.0, 'experience': 1.0, 'projects': 0.8,
+                   'certifications': 1.5, 'languages': 1.5, 'education': 2.0, 'other': 0.3, 'header': 0.5}
+
+_BULLET_RE = re.compile(r'^\s*([•●▪■◦‣∙·*\-–—>]|\d+[.)])\s+')
+_DATE_RE = re.compile(r'\b(19|20)\d{2}\b|\bpresent\b|\bcurrent\b|\b\d{1,2}/\d{2,4}\b', re.IGNORECASE)
+_TITLE_SEP_RE = re.compile(r'\s[|@–—-]\s|,\s|\sat\s')
+
+DEFAULT_RESUME_TOKENS = 850     # the old resume[:3500] cut was ~875 tokens
+DEFAULT_JD_TOKENS = 350         # the old job_description[:1500] cut was ~375 tokens
+
+
+def estimate_tokens(text):
+    """Cheap local token estimate (~4 chars/token for English, as with Llama-3 tokenizers)"""
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def extract_keywords(text):
+    return {w for w in re.findall(r'\b\w+\b', text.lower()) if len(w) > 3 and w not in STOP_WORDS}
+
+
+def clean_line(line):
+    line = _BULLET_RE.sub('- ', line.strip())
+    return re.sub(r'\s+', ' ', line).strip()
+
+
+def _is_title_shaped(line):
+    """'Senior Engineer, Acme Corp' / 'Acme Corp | Berlin': short and mostly capitalised words"""
+    words = re.findall(r'[^\W\d_][\w&.\'-]*', line)
+    if not words or len(line) > 80 or not line[0].isupper():
+        return False
+    capitalised = sum(w[0].isupper() for w in words) / len(words)
+    return capitalised >= 0.6 or (capitalised >= 0.4 and bool(_TITLE_SEP_RE.search(line)))
+
+
+def join_wrapped_lines(lines):
+    """PDF text wraps long bullets onto several lines: fold a line that follows a bullet back into it,
+    unless it has a date or looks like a title/company line"""
+    out = []
+    for line in lines:
+        if (out and out[-1].startswith('- ') and not line.startswith('- ')
+                and not _DATE_RE.search(line) and not _is_title_shaped(line)):
+            out[-1] += ' ' + line
+        else:
+            out.append(line)
+    return out
+
+
+def parse_sections(text):
+    """[(section_name, [lines])] in document order. Lines before the first heading are 'header'"""
+    sections = [('header', [])]
+    for raw in (text or '').split('\n'):
+        line = clean_line(raw)
+        if not line:
+            continue
+        heading = next((name for name, rx in _HEADING_RES if len(line) <= 40 and rx.match(line)), None)
+        if heading:
+            sections.append((heading, []))
+        else:
+            sections[-1][1].append(line)
+    return [(name, join_wrapped_lines(lines)) for name, lines in sections if lines]
+
+
+def _dedupe(lines, seen):
+    out = []
+    for line in lines:
+        key = re.sub(r'\W+', '', line.lower())
+        if key and key not in seen:
+            seen.add(key)
+            out.append(line)
+    return out
+
+
+def _is_anchor(section, line, index):
+    """Lines that identify an entry (name/contact, job title/company/dates, degree) are never dropped"""
+    if section == 'header':
+        return index < 4
+    if section in ('experience', 'education', 'projects'):
+        return not line.startswith('- ') and (len(line) <= 60 or bool(_DATE_RE.search(line)))
+    return False
+
+
+def compact_resume(text, job_keywords, token_budget=DEFAULT_RESUME_TOKENS):
+    """Pack the most JD-relevant resume content into token_budget tokens, keeping document order"""
+    seen = set()
+    entries = []  # (order, section, line, priority)
+    for section, lines in parse_sections(text):
+        if section != 'header':
+            entries.append((len(entries), section, f"## {section.upper()}", math.inf))
+        for i, line in enumerate(_dedupe(lines, seen)):
+            if _is_anchor(section, line, i):
+                priority = math.inf
+            else:
+                words = set(re.findall(r'\b\w+\b', line.lower()))
+                priority = 2 * len(words & job_keywords) + SECTION_WEIGHTS.get(section, 1.0) - len(entries) * 1e-4
+            entries.append((len(entries), section, line, priority))
+
+    used, kept = 0, set()
+    for order, _, line, _ in sorted(entries, key=lambda e: -e[3]):
+        cost = estimate_tokens(line) + 1
+        if used + cost > token_budget:
+            continue
+        used += cost
+        kept.add(order)
+
+    out = []
+    for order, section, line, _ in entries:
+        if order in kept:
+            out.append(line)
+    # Drop headings whose section had nothing kept
+    return '\n'.join(l for i, l in enumerate(out) if not (l.startswith('## ') and (i + 1 == len(out) or out[i + 1].startswith('## '))))
+
+
+def compact_job_description(text, token_budget=DEFAULT_JD_TOKENS):
+    """Dedupe / whitespace-compress the JD and keep its keyword-densest sentences within budget"""
+    sentences = _dedupe([clean_line(s) for s in re.split(r'(?<=[.!?])\s+|\n+', text or '')], set())
+    scored = [(i, s, len(extract_keywords(s)) / (estimate_tokens(s) or 1)) for i, s in enumerate(sentences)]
+    used, kept = 0, set()
+    for i, s, _ in sorted(scored, key=lambda x: -x[2]):
+        cost = estimate_tokens(s) + 1
+        if used + cost <= token_budget:
+            used += cost
+            kept.add(i)
+    return '\n'.join(s for i, s, _ in scored if i in kept)
+
+
+RESUME_SCHEMA = ('{"name": str, "contact": {"email": str, "phone": str, "location": str, "linkedin": str}, '
+                 '"summary": str, "experience": [{"title": str, "company": str, "duration": "MM/YYYY - MM/YYYY", '
+                 '"achievements": [str]}], "education": [{"degree": str, "institution": str, "year": str, "gpa": str}], '
+                 '"skills": [str], "certifications": [str], "languages": [str], "projects": ["Name: description"]}')
+
+
+def contact_defaults(resume_data):
+    contact = resume_data.get('contact', {})
+    return {
+        'name': resume_data.get('name', 'Professional'),
+        'email': contact['emails'][0] if contact.get('emails') else 'email@example.com',
+        'phone': contact['phones'][0] if contact.get('phones') else '+1234567890',
+        'linkedin': contact['linkedin'][0] if contact.get('linkedin') else ''
+    }
+
+
+def build_resume_prompt(resume_data, job_description, resume_tokens=DEFAULT_RESUME_TOKENS, jd_tokens=DEFAULT_JD_TOKENS):
+    """Returns (prompt, stats) where stats reports the estimated input tokens before/after compaction"""
+    original_text = resume_data.get('full_text', '')
+    job_keywords = extract_keywords(job_description)
+    resume_part = compact_resume(original_text, job_keywords, resume_tokens)
+    jd_part = compact_job_description(job_description, jd_tokens)
+    c = contact_defaults(resume_data)
+
+    prompt = f"""You are an expert ATS resume writer. IMPROVE this resume using the job description.
+
+**ORIGINAL RESUME:**
+{resume_part}
+
+**JOB DESCRIPTION:**
+{jd_part}
+
+**RULES:**
+1. PRESERVE truthful info (names, companies, dates)
+2. FIX grammar and spelling
+3. ADD keywords from JD naturally
+4. ENHANCE bullets with action verbs + metrics
+5. Include LinkedIn if available
+6. Add Languages section if mentioned
+
+**RETURN ONLY THIS JSON SHAPE (NO MARKDOWN, NO CODE BLOCKS):**
+{RESUME_SCHEMA}
+Use name "{c['name']}", email "{c['email']}", phone "{c['phone']}", linkedin "{c['linkedin']}". Summary: 2-3 sentences with years of experience, JD-matching skills, quantifiable achievements. 3-5 achievements per job.
+
+QUALITY: Use strong action verbs (Led, Achieved, Implemented). Add metrics (%, $, numbers). Keep bullets 10-20 words. Match JD keywords."""
+
+    stats = {
+        'prompt_tokens': estimate_tokens(prompt),
+        'resume_tokens': estimate_tokens(resume_part),
+        'resume_tokens_original': estimate_tokens(original_text),
+        'jd_tokens': estimate_tokens(jd_part),
+        'jd_tokens_original': estimate_tokens(job_description)
+    }
+    return prompt, stats
+
+
+# --- Per-section generation -------------------------------------------------
+
+SECTION_MAX_TOKENS = {'summary': 300, 'experience': 600, 'skills': 700, 'projects': 500}
+
+SECTION_RULES = ("PRESERVE truthful info (names, companies, dates). FIX grammar and spelling. "
+                 "ADD JD keywords naturally. Use strong action verbs and metrics (%, $, numbers). "
+                 "Return ONLY JSON, no markdown.")
+
+
+def split_experience(lines):
+    """Group experience lines into entries; a new entry starts at a title/company/date line after bullets"""
+    entries = []
+    for i, line in enumerate(lines):
+        anchor = _is_anchor('experience', line, i)
+        if not entries or (anchor and entries[-1][1]):
+            entries.append([[], False])
+        entries[-1][0].append(line)
+        entries[-1][1] = entries[-1][1] or not anchor
+    return ['\n'.join(entry_lines) for entry_lines, _ in entries]
+
+
+def top_keywords(text, limit=30):
+    words = [w for w in re.findall(r'\b\w+\b', text.lower()) if len(w) > 3 and w not in STOP_WORDS]
+    return [w for w, _ in Counter(words).most_common(limit)]
+
+
+def fingerprint(*parts):
+    return hashlib.sha1('\x1f'.join(parts).encode()).hexdigest()
+
+
+def build_section_prompts(resume_data, job_description, resume_tokens=DEFAULT_RESUME_TOKENS, jd_tokens=DEFAULT_JD_TOKENS):
+    """Independent prompts for summary, each experience entry, skills/education/certs and projects.
+
+    Returns ([(key, prompt, max_tokens, fingerprint)], stats). Keys are 'summary', 'experience:<n>',
+    'skills', 'projects'. A fingerprint covers only the inputs that should force a rewrite: the
+    summary follows the whole JD and skills follow its keywords, while an experience entry or the
+    projects only change when their own text or the JD keywords they already mention change.
+    """
+    original_text = resume_data.get('full_text', '')
+    sections = {}
+    for name, lines in parse_sections(original_text):
+        sections.setdefault(name, []).extend(lines)
+
+    keyword_list = top_keywords(job_description)
+    keywords = ', '.join(keyword_list)
+
+    def relevant_keywords(text):
+        words = set(re.findall(r'\b\w+\b', text.lower()))
+        return ','.join(sorted(k for k in keyword_list if k in words))
+    jd_part = compact_job_description(job_description, jd_tokens)
+    overview = compact_resume(original_text, extract_keywords(job_description), resume_tokens // 2)
+
+    prompts = [('summary', f"""Write the professional summary for this resume, targeted at the job description.
+
+**RESUME:**
+{overview}
+
+**JOB DESCRIPTION:**
+{jd_part}
+
+{SECTION_RULES}
+Return {{"summary": "2-3 sentences with years of experience, JD-matching skills, quantifiable achievements", "location": "City, State from the resume or empty"}}""",
+                SECTION_MAX_TOKENS['summary'], fingerprint('summary', overview, jd_part))]
+
+    for n, entry in enumerate(split_experience(sections.get('experience', []))):
+        prompts.append((f'experience:{n}', f"""Rewrite this ONE job entry for an ATS-optimized resume.
+
+**ENTRY:**
+{compact_resume(entry, extract_keywords(job_description), resume_tokens // 2)}
+
+**JD KEYWORDS:** {keywords}
+
+{SECTION_RULES} 3-5 achievements, 10-20 words each.
+Return {{"title": str, "company": str, "duration": "MM/YYYY - MM/YYYY", "achievements": [str]}}""",
+                        SECTION_MAX_TOKENS['experience'], fingerprint('experience', entry, relevant_keywords(entry))))
+
+    details = '\n'.join(f"## {name.upper()}\n" + '\n'.join(sections[name])
+                        for name in ('skills', 'certifications', 'languages', 'education') if sections.get(name))
+    prompts.append(('skills', f"""Extract and improve the skills, certifications, languages and education of this resume.
+
+**RESUME SECTIONS:**
+{details or overview}
+
+**JD KEYWORDS:** {keywords}
+
+{SECTION_RULES} Only list skills the candidate plausibly has; order JD-relevant skills first.
+Return {{"skills": [str], "certifications": [str], "languages": [str], "education": [{{"degree": str, "institution": str, "year": str, "gpa": str}}]}}""",
+                    SECTION_MAX_TOKENS['skills'], fingerprint('skills', details or overview, keywords)))
+
+    if sections.get('projects'):
+        prompts.append(('projects', f"""Rewrite the projects of this resume for the job description.
+
+**PROJECTS:**
+{chr(10).join(sections['projects'])}
+
+**JD KEYWORDS:** {keywords}
+
+{SECTION_RULES}
+Return {{"projects": ["Project name: description with impact metrics"]}}""",
+                        SECTION_MAX_TOKENS['projects'], fingerprint('projects', *sections['projects'], relevant_keywords(' '.join(sections['projects'])))))
+
+    stats = {
+        'prompt_tokens': sum(estimate_tokens(p[1]) for p in prompts),
+        'sections': len(prompts),
+        'resume_tokens_original': estimate_tokens(original_text),
+        'jd_tokens_original': estimate_tokens(job_description)
+    }
+    return prompts, stats
+
+
+def _str_list(value):
+    if isinstance(value, str):
+        value = [value]
+    return [str(v).strip() for v in (value or []) if str(v).strip()]
+
+
+def apply_section(resume_content, key, result):
+    """Write one section result (as returned for prompt `key`) into resume_content, normalising types"""
+    kind, _, index = key.partition(':')
+    if kind == 'summary':
+        resume_content['summary'] = str(result.get('summary', '')).strip()
+        resume_content.setdefault('contact', {})['location'] = str(result.get('location', '')).strip()
+    elif kind == 'experience':
+        entry = {
+            'title': str(result.get('title', '')).strip(),
+            'company': str(result.get('company', '')).strip(),
+            'duration': str(result.get('duration', '')).strip(),
+            'achievements': _str_list(result.get('achievements'))
+        }
+        experience = resume_content.setdefault('experience', [])
+        n = int(index)
+        while len(experience) <= n:
+            experience.append({})
+        experience[n] = entry
+    elif kind == 'skills':
+        education = [e for e in (result.get('education') or []) if isinstance(e, dict)]
+        resume_content['education'] = [{k: str(e.get(k, '')).strip() for k in ('degree', 'institution', 'year', 'gpa')} for e in education]
+        for field in ('skills', 'certifications', 'languages'):
+            resume_content[field] = _str_list(result.get(field))
+    elif kind == 'projects':
+        resume_content['projects'] = _str_list(result.get('projects'))
+    return resume_content
+
+
+def merge_sections(resume_data, parts):
+    """Assemble per-section results into the resume_content schema used by the preview and PDF"""
+    c = contact_defaults(resume_data)
+    resume_content = {
+        'name': c['name'],
+        'contact': {'email': c['email'], 'phone': c['phone'], 'location': '', 'linkedin': c['linkedin']},
+        'summary': '', 'experience': [], 'education': [], 'skills': [],
+        'certifications': [], 'languages': [], 'projects': []
+    }
+    for key in sorted(parts, key=lambda k: (k.partition(':')[0], int(k.partition(':')[2] or 0))):
+        apply_section(resume_content, key, parts[key])
+    return resume_content
+
+
+def build_bullet_prompt(bullet, context, job_description):
+    """Prompt to rewrite a single achievement / project bullet"""
+    return f"""Rewrite this ONE resume bullet for an ATS-optimized resume.
+
+**CONTEXT:** {context}
+**BULLET:** {bullet}
+**JD KEYWORDS:** {', '.join(top_keywords(job_description))}
+
+{SECTION_RULES} 10-20 words. Keep it truthful to the original.
+Return {{"bullet": str}}"""
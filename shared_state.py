@@ -0,0 +1,138 @@
+"""
+Cross-Process Shared State
+
+Rate-limit counters and hot result caches kept in one local SQLite file (WAL
+mode), so every worker of a multi-process server (gunicorn) enforces the same
+limits and reuses the same cached results. No external service is needed.
+
+Importing this module registers the "sqlite" scheme with Flask-Limiter:
+storage_uri="sqlite:///database/shared_state.db"
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from limits.storage import Storage
+
+DEFAULT_PATH = os.path.join('database', 'shared_state.db')
+PURGE_EVERY = 1000      # writes between sweeps of expired rows
+
+_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires REAL NOT NULL) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS cache_entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL) WITHOUT ROWID;
+'''
+
+
+def path_from_uri(uri):
+    """sqlite:///relative/path.db, sqlite:////absolute/path.db or sqlite:// (default file)"""
+    path = (uri or '').split('://', 1)[-1]
+    return path[1:] if len(path) > 1 and path.startswith('/') else DEFAULT_PATH
+
+
+class _Connections:
+    """One autocommit connection per (process, thread); a forked worker never reuses its parent's"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+
+    def get(self):
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.executescript(_SCHEMA)
+            local.db, local.pid = db, os.getpid()
+        return local.db
+
+    def wrote(self, table):
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            self.get().execute(f'DELETE FROM {table} WHERE expires <= ?', (time.time(),))
+
+
+class SQLiteStorage(Storage):
+    """Fixed-window rate-limit counters in SQLite; one atomic upsert per hit"""
+
+    STORAGE_SCHEME = ['sqlite']
+
+    def __init__(self, uri=None, wrap_exceptions=False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self._connections = _Connections(path_from_uri(uri))
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def incr(self, key, expiry, elastic_expiry=False, amount=1):
+        now = time.time()
+        # Both CASEs see the old row, so an expired window restarts at `amount`
+        count = self._connections.get().execute(
+            'INSERT INTO rate_limits (key, count, expires) VALUES (?, ?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET '
+            'count = CASE WHEN expires <= ? THEN excluded.count ELSE count + excluded.count END, '
+            'expires = CASE WHEN expires <= ? OR ? THEN excluded.expires ELSE expires END '
+            'RETURNING count',
+            (key, amount, now + expiry, now, now, bool(elastic_expiry))
+        ).fetchone()[0]
+        self._connections.wrote('rate_limits')
+        return count
+
+    def get(self, key):
+        row = self._connections.get().execute(
+            'SELECT count FROM rate_limits WHERE key = ? AND expires > ?', (key, time.time())).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        row = self._connections.get().execute(
+            'SELECT expires FROM rate_limits WHERE key = ? AND expires > ?', (key, time.time())).fetchone()
+        return row[0] if row else time.time()
+
+    def check(self):
+        try:
+            self._connections.get().execute('SELECT 1')
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        return self._connections.get().execute('DELETE FROM rate_limits').rowcount
+
+    def clear(self, key):
+        self._connections.get().execute('DELETE FROM rate_limits WHERE key = ?', (key,))
+
+
+class SharedCache:
+    """TTL cache of JSON-serializable values, visible to every worker process"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self._connections = _Connections(path)
+
+    def get(self, key):
+        row = self._connections.get().execute(
+            'SELECT value FROM cache_entries WHERE key = ? AND expires > ?', (key, time.time())).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl):
+        self._connections.get().execute(
+            'INSERT INTO cache_entries (key, value, expires) VALUES (?, ?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires = excluded.expires',
+            (key, json.dumps(value), time.time() + ttl))
+        self._connections.wrote('cache_entries')
+
+    def get_or_set(self, key, compute, ttl):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value, ttl)
+        return value
+
+    def delete(self, key):
+        self._connections.get().execute('DELETE FROM cache_entries WHERE key = ?', (key,))
@@ -0,0 +1,87 @@
+"""
+Static Frontend Assets
+
+The HTML pages are read once, precompressed (brotli when available, gzip) and
+kept in memory. Requests are answered from memory with strong ETags,
+conditional 304s and Cache-Control, so page loads cost the workers next to nothing.
+"""
+
+import os
+import re
+import gzip
+import hashlib
+from werkzeug.wrappers import Response
+from werkzeug.http import http_date
+
+try:
+    import brotli
+except ImportError:  # optional - gzip only
+    brotli = None
+
+PAGE_PATTERN = re.compile(r'^\d+-[\w-]+\.html$')
+
+
+class StaticAsset:
+    __slots__ = ('path', 'mtime', 'mimetype', 'etag', 'last_modified', 'variants')
+
+    def __init__(self, path, mimetype='text/html'):
+        with open(path, 'rb') as f:
+            body = f.read()
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(body).hexdigest()[:20]
+        self.last_modified = http_date(self.mtime)
+        # encoding -> (bytes, etag); each representation gets its own strong ETag
+        self.variants = {None: (body, self.etag)}
+        gz = gzip.compress(body, compresslevel=9, mtime=0)
+        if len(gz) < len(body):
+            self.variants['gzip'] = (gz, f"{self.etag}-gz")
+        if brotli:
+            br = brotli.compress(body, quality=11)
+            if len(br) < len(body):
+                self.variants['br'] = (br, f"{self.etag}-br")
+
+    def select(self, accept_encodings):
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and accept_encodings[encoding] > 0:
+                return encoding
+        return None
+
+
+def load_assets(directory, pattern=PAGE_PATTERN):
+    """{filename: StaticAsset} for every matching file in directory"""
+    assets = {}
+    for name in sorted(os.listdir(directory)):
+        if pattern.match(name):
+            assets[name] = StaticAsset(os.path.join(directory, name))
+    return assets
+
+
+def refresh_if_changed(assets, name):
+    """Dev mode: pick up edited files without a restart"""
+    asset = assets.get(name)
+    if asset and os.path.getmtime(asset.path) != asset.mtime:
+        assets[name] = asset = StaticAsset(asset.path, asset.mimetype)
+    return asset
+
+
+def serve(asset, request, max_age=3600):
+    encoding = asset.select(request.accept_encodings)
+    body, etag = asset.variants[encoding]
+    headers = {
+        'ETag': f'"{etag}"',
+        'Cache-Control': f'public, max-age={max_age}',
+        'Last-Modified': asset.last_modified,
+        'Vary': 'Accept-Encoding'
+    }
+
+    # Any encoding of the same bytes is still fresh for this client
+    if request.if_none_match and any(request.if_none_match.contains_weak(tag) for _, tag in asset.variants.values()):
+        return Response(status=304, headers=headers)
+    if not request.if_none_match and request.if_modified_since and request.if_modified_since.timestamp() >= int(asset.mtime):
+        return Response(status=304, headers=headers)
+
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    return Response(body, status=200, mimetype=asset.mimetype, headers=headers)
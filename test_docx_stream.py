@@ -0,0 +1,44 @@
+"""
+Tests for docx_stream's streaming extractor
+"""
+
+import zipfile
+import docx_stream
+
+NAMESPACES = ('xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+              'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+              'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+              'xmlns:v="urn:schemas-microsoft-com:vml"')
+
+
+def paragraph(text):
+    return f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>'
+
+
+def write_docx(path, body):
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr('word/document.xml', f'<w:document {NAMESPACES}><w:body>{body}</w:body></w:document>')
+    return path
+
+
+def text_box(text):
+    # Word stores every text box twice: the DrawingML Choice and a VML Fallback copy
+    return ('<w:p><w:r><mc:AlternateContent>'
+            f'<mc:Choice Requires="wps"><wps:txbx><w:txbxContent>{paragraph(text)}</w:txbxContent></wps:txbx></mc:Choice>'
+            f'<mc:Fallback><v:textbox><w:txbxContent>{paragraph(text)}'
+            '<w:tbl><w:tr><w:tc><w:p><w:r><w:t>boxed cell</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+            '</w:txbxContent></v:textbox></mc:Fallback>'
+            '</mc:AlternateContent></w:r></w:p>')
+
+
+def test_text_box_fallback_does_not_swallow_later_paragraphs(tmp_path):
+    path = write_docx(tmp_path / 'box.docx', paragraph('Before') + text_box('Boxed') + paragraph('After1') + paragraph('After2'))
+    assert docx_stream.extract_text(path).split('\n') == ['Before', 'Boxed', 'After1', 'After2']
+
+
+def test_nested_table_text_stays_in_its_cell(tmp_path):
+    inner = '<w:tbl><w:tr><w:tc>' + paragraph('in1') + '</w:tc><w:tc>' + paragraph('in2') + '</w:tc></w:tr></w:tbl>'
+    outer = ('<w:tbl><w:tr><w:tc>' + paragraph('c10') + '<w:p/>' + paragraph('c11') + inner + paragraph('after')
+             + '</w:tc><w:tc>' + paragraph('right') + '</w:tc></w:tr></w:tbl>')
+    path = write_docx(tmp_path / 'nested.docx', outer + paragraph('body'))
+    assert docx_stream.extract_text(path).split('\n') == ['c10', 'c11', 'in1', 'in2', 'after', 'right', 'body']
@@ -0,0 +1,48 @@
+"""
+Tests for prompt_builder's resume parsing
+"""
+
+import prompt_builder
+
+# PyPDF2-style extraction: long bullets wrap onto several physical lines
+WRAPPED_RESUME = """Jane Doe
+jane@example.com | +1 555 0100
+EXPERIENCE
+Senior Engineer, Acme Corp 2019 - Present
+• Built a Kubernetes platform serving 40 teams with
+high reliability and observability
+• Led migration of 120 services to Terraform, cutting
+provisioning time by 70% and standardising infra
+across the company
+Engineer, Beta Inc 2017 - 2019
+• Designed Kafka pipelines processing 2M events/day for
+Analytics and Billing teams
+EDUCATION
+BSc Computer Science, State University 2016"""
+
+
+def experience_lines(text):
+    return dict(prompt_builder.parse_sections(text))['experience']
+
+
+def test_wrapped_bullets_are_joined():
+    lines = experience_lines(WRAPPED_RESUME)
+    assert '- Built a Kubernetes platform serving 40 teams with high reliability and observability' in lines
+    assert ('- Led migration of 120 services to Terraform, cutting provisioning time by 70% '
+            'and standardising infra across the company') in lines
+    assert '- Designed Kafka pipelines processing 2M events/day for Analytics and Billing teams' in lines
+
+
+def test_wrapped_bullets_do_not_create_entries():
+    entries = prompt_builder.split_experience(experience_lines(WRAPPED_RESUME))
+    assert len(entries) == 2
+    assert entries[0].startswith('Senior Engineer, Acme Corp')
+    assert entries[1].startswith('Engineer, Beta Inc')
+
+
+def test_title_lines_after_bullets_start_new_entries():
+    text = WRAPPED_RESUME.replace("EDUCATION", "Data Platform Lead\nGamma LLC | Berlin\n• Owned the warehouse\nEDUCATION")
+    lines = experience_lines(text)
+    entries = prompt_builder.split_experience(lines)
+    assert len(entries) == 3
+    assert entries[2] == 'Data Platform Lead\nGamma LLC | Berlin\n- Owned the warehouse'
@@ -0,0 +1,17 @@
+"""
+WSGI entry point for production serving
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+gunicorn.conf.py sets preload_app, so this runs once in the master: heavy
+imports, init_db and the vector-index backfill happen before the workers fork
+and are shared copy-on-write instead of repeated (and raced) in every worker.
+"""
+
+from app import create_app, get_match_index
+
+app = create_app(preload=True)
+
+with app.app_context():
+    get_match_index('resume')
+    get_match_index('job')